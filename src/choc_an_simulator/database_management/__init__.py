@@ -9,6 +9,7 @@ and schema compatibility.
 from .load_records import load_records_from_file
 from .edit_records import update_record, remove_record, add_records_to_file
 from .reports import save_report
+from .record_buffer import RecordBuffer
 
 __all__ = [
     "load_records_from_file",
@@ -16,4 +17,5 @@ __all__ = [
     "remove_record",
     "add_records_to_file",
     "save_report",
+    "RecordBuffer",
 ]
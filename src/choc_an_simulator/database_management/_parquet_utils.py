@@ -4,17 +4,20 @@ import os
 
 # Directory where all parquet files are stored.
 _PARQUET_DIR_ = str(files("choc_an_simulator") / "storage")
+# File extension used for each supported storage format.
+_FILE_EXTENSIONS_ = {"parquet": ".pkt", "feather": ".arrow"}
 
 
-def _convert_parquet_name_to_path_(name: str) -> str:
+def _convert_parquet_name_to_path_(name: str, file_format: str = "parquet") -> str:
     """
-    Internal function to convert a file name to a full path for Parquet files.
+    Internal function to convert a file name to a full path for Parquet or Feather files.
 
     Args-
         name (str): Base name of the file.
+        file_format (str): Storage format of the file, "parquet" or "feather".
 
     Returns-
         str: Full path for the specified file name.
 
     """
-    return os.path.join(_PARQUET_DIR_, name + ".pkt")
+    return os.path.join(_PARQUET_DIR_, name + _FILE_EXTENSIONS_[file_format])
@@ -1,13 +1,19 @@
 """Functions for writing records to a database file."""
+import os
 import pandas as pd
 import pyarrow as pa
+import pyarrow.feather as feather
 from ._parquet_utils import _convert_parquet_name_to_path_
+from .load_records import invalidate_cache
 from ..schemas import TableInfo
 
+# Number of rows written per record batch in Feather files.
+_FEATHER_CHUNK_SIZE_ = 64 * 1024
+
 
 def _overwrite_records_to_file_(records: pd.DataFrame, table_info: TableInfo) -> None:
     """
-        Internal function to overwrite a Parquet file with new records.
+        Internal function to overwrite a Parquet or Feather file with new records.
 
         Args-
             records (pd.DataFrame): Records to be written.
@@ -29,8 +35,26 @@ def _overwrite_records_to_file_(records: pd.DataFrame, table_info: TableInfo) ->
     except ArithmeticError as err_limit:
         raise err_limit
 
+    path = _convert_parquet_name_to_path_(table_info.name, table_info.file_format)
+    # Write to a new file and swap it in, so memory-mapped reads of the old file
+    # are never truncated underneath the reader.
+    temp_path = path + ".tmp"
     try:
-        path = _convert_parquet_name_to_path_(table_info.name)
-        records.to_parquet(path, schema=table_info.schema)
+        if table_info.file_format == "feather":
+            table = pa.Table.from_pandas(
+                records, schema=table_info.schema, preserve_index=False
+            )
+            feather.write_feather(
+                table, temp_path, compression="lz4", chunksize=_FEATHER_CHUNK_SIZE_
+            )
+        else:
+            records.to_parquet(temp_path, schema=table_info.schema)
+        os.replace(temp_path, path)
     except pa.ArrowIOError as err_io:
         raise err_io
+    finally:
+        # Remove a partly written file, if the write failed before it was swapped in.
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        # The file may have changed, even if the write failed part way through.
+        invalidate_cache(path)
@@ -1,26 +1,46 @@
 """Functions for loading data from the database."""
-from typing import Dict, Callable, Any, Optional
+from typing import Dict, Callable, Any, Iterable, List, Optional, Tuple
+from functools import lru_cache, reduce
 import operator
+import os
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
 from ._parquet_utils import _convert_parquet_name_to_path_
 from ..schemas import TableInfo
 
+# Filesystem that memory-maps files opened for filtered Feather scans.
+_MMAP_FILESYSTEM_ = pafs.LocalFileSystem(use_mmap=True)
+# Validated records of tables that set cache_records, keyed by file path.
+# Each entry holds the (modification time, size) version of the file and all of its records.
+_RECORDS_CACHE_: Dict[str, Tuple[Tuple[int, int], pa.Table]] = {}
+
 
 def load_records_from_file(
     table_info: TableInfo,
     eq_cols: Optional[Dict[str, Any]] = None,
     lt_cols: Optional[Dict[str, Any]] = None,
     gt_cols: Optional[Dict[str, Any]] = None,
+    columns: Optional[List[str]] = None,
+    isin_cols: Optional[Dict[str, Iterable[Any]]] = None,
 ) -> pd.DataFrame:
     """
-    Load records from a Parquet file, optionally applying filters for record selection.
+    Load records from a database file, optionally applying filters for record selection.
+
+    Filters are pushed down into the file scan, so only matching records are read.
 
     Args-
         table_info (TableInfo): Object with schema and table details.
         eq_cols (Optional[Dict[str, Any]]): Specifies columns and values for equality filtering.
         lt_cols (Optional[Dict[str, Any]]): Specifies columns and values for less-than filtering.
         gt_cols (Optional[Dict[str, Any]]): Specifies columns and values for greater-than filtering.
+        columns (Optional[List[str]]): Columns to return. Only these columns are read from the file.
+        isin_cols (Optional[Dict[str, Iterable[Any]]]):
+            Specifies columns and the sets of values to filter them to.
 
     Returns-
         pd.DataFrame:
@@ -48,62 +68,127 @@ def load_records_from_file(
             table_info = example_table_info,
             eq_cols = {"ID" : 1234}
         )
+
+        #Ex 4. Get only the IDs of all records
+        records = load_records_from_file(
+            table_info = example_table_info,
+            columns = ["ID"]
+        )
+
+        #Ex 5. Get the records with ID 1234 or 5678
+        records = load_records_from_file(
+            table_info = example_table_info,
+            isin_cols = {"ID" : [1234, 5678]}
+        )
     """
+    filter_expression = _build_filter_expression_(
+        table_info,
+        [
+            (eq_cols, operator.eq),
+            (lt_cols, operator.lt),
+            (gt_cols, operator.gt),
+            (isin_cols, _is_in_),
+        ],
+    )
     try:
-        records = _load_all_records_from_file_(table_info)
+        records = _load_all_records_from_file_(table_info, columns, filter_expression)
     except pa.ArrowInvalid as err_invalid:
         raise err_invalid
     except pa.ArrowIOError as err_io:
         raise err_io
     except KeyError as err_key:
         raise err_key
-
-    # Apply filters
-    records = _apply_filter(records, eq_cols, operator.eq, table_info)
-    records = _apply_filter(records, lt_cols, operator.lt, table_info)
-    records = _apply_filter(records, gt_cols, operator.gt, table_info)
+    except TypeError as err_type:
+        raise err_type
 
     return records
 
 
-def _apply_filter(
-    records: pd.DataFrame,
-    col_filters: Optional[Dict[str, Any]],
-    operator: Callable,
+def invalidate_cache(path: str) -> None:
+    """
+    Forget cached records and schemas read from a file, after the file is written.
+
+    Args-
+        path (str): Path of the file that was written.
+    """
+    # Schemas are cached by file version, so entries for the old file are never reused.
+    # Clearing them only frees their memory.
+    _read_file_schema_version_.cache_clear()
+    _RECORDS_CACHE_.pop(path, None)
+
+
+def _build_filter_expression_(
     table_info: TableInfo,
-) -> pd.DataFrame:
+    col_filters: List[Tuple[Optional[Dict[str, Any]], Callable]],
+) -> Optional[pc.Expression]:
     """
-    Apply a filter to the DataFrame based on the specified operator.
+    Combine column filters into a single expression that can be pushed into a file scan.
 
     Args-
-        records (pd.DataFrame): The DataFrame to be filtered.
-        col_filters (Dict[str, DB_FIELD_PYTYPE]): The columns and values for filtering.
-        operator (Callable): The comparison operator (e.g., eq, lt, gt).
         table_info (TableInfo): Object with schema and table details.
+        col_filters (List[Tuple[Optional[Dict[str, Any]], Callable]]):
+            Pairs of column/value filters and the comparison operator (e.g., eq, lt, gt)
+            applied to each of them.
 
     Returns-
-        pd.DataFrame: Filtered DataFrame.
+        pc.Expression: All filters joined with a logical and.
+        None: No filters were given.
+
+    Raises-
+        KeyError: A filtered column is not in the schema.
+        TypeError: A filter value can't be compared with Arrow data.
     """
-    if col_filters is None:
-        return records
-    for col, val in col_filters.items():
-        if col not in table_info.schema.names:
-            raise KeyError(f"Column name {col} not found in schema.")
-        try:
-            records = records[operator(records[col], val)]
-        except TypeError as err_type:
-            raise TypeError(
-                f"{err_type}: Operation {operator} on {col} with value {val} not supported."
-            )
-    return records
+    expressions = []
+    for col_values, compare in col_filters:
+        if col_values is None:
+            continue
+        for col, val in col_values.items():
+            if col not in table_info.schema.names:
+                raise KeyError(f"Column name {col} not found in schema.")
+            try:
+                expressions.append(compare(pc.field(col), val))
+            except pa.ArrowInvalid as err_invalid:
+                raise TypeError(
+                    f"{err_invalid}: Operation {compare} on {col} with value {val} not supported."
+                )
+            except pa.ArrowTypeError as err_type:
+                raise TypeError(
+                    f"{err_type}: Operation {compare} on {col} with value {val} not supported."
+                )
+            except OverflowError as err_overflow:
+                raise TypeError(
+                    f"{err_overflow}: Operation {compare} on {col} with value {val} not supported."
+                )
+    if len(expressions) == 0:
+        return None
+    return reduce(operator.and_, expressions)
+
+
+def _is_in_(field: pc.Expression, values: Iterable[Any]) -> pc.Expression:
+    """Internal comparison used by isin_cols, that matches a field to any of several values."""
+    return field.isin(values)
 
 
-def _load_all_records_from_file_(table_info: TableInfo) -> pd.DataFrame:
+def _load_all_records_from_file_(
+    table_info: TableInfo,
+    columns: Optional[List[str]] = None,
+    filter_expression: Optional[pc.Expression] = None,
+) -> pd.DataFrame:
     """
-    Internal function to load all records from a Parquet file into a DataFrame.
+    Internal function to load all records from a Parquet or Feather file into a DataFrame.
+
+    Tables that set cache_records are kept in memory and reused until the file's modification
+    time or size changes. Filters and column selections are then applied to the cached records.
+
+    Tables stored in a format other than Parquet are read from their older Parquet file, if
+    they have not been written since their file_format changed. The next write of the table
+    saves its records in the new format.
 
     Args-
         table_info (TableInfo): Object with schema and table details.
+        columns (Optional[List[str]]): Columns to read from the file, or None to read all columns.
+        filter_expression (Optional[pc.Expression]):
+            Only read records matching this expression, or None to read all records.
 
     Returns-
         pd.DataFrame:
@@ -112,21 +197,263 @@ def _load_all_records_from_file_(table_info: TableInfo) -> pd.DataFrame:
     Raises-
         pyarrow.ArrowInvalid: File format is invalid.
         pyarrow.ArrowIOError: I/O error occurs.
-        KeyError: File columns do not match schema.
+        KeyError: File columns do not match schema, or a requested column is not in the schema.
+        TypeError: The filter expression can't be evaluated against the file's columns.
     """
-    path = _convert_parquet_name_to_path_(table_info.name)
+    if columns is not None and not table_info.includes_columns(columns):
+        raise KeyError(f"Columns {columns} not found in {table_info.name} schema.")
+    path, file_format = _find_records_file_(table_info)
     try:
-        records = pd.read_parquet(path)
+        if table_info.cache_records:
+            return _select_records_(
+                _load_cached_table_(table_info, path, file_format),
+                columns,
+                filter_expression,
+            ).to_pandas()
+        file_schema = _read_file_schema_(path, file_format)
+        if _has_older_types_(file_schema, table_info):
+            # Filters may not apply to the file's types, so convert all records before selecting.
+            table = _select_records_(
+                _convert_table_(_read_table_(path, file_format), table_info),
+                columns,
+                filter_expression,
+            )
+        else:
+            if columns is not None or filter_expression is not None:
+                # A partial read may not include every row or column, so check the file's columns.
+                table_info.check_columns(file_schema.names)
+            table = _read_table_(path, file_format, columns, filter_expression)
+        records = table.to_pandas()
     except FileNotFoundError:
-        return pa.Table.from_pylist([], schema=table_info.schema).to_pandas()
+        empty_table = pa.Table.from_pylist([], schema=table_info.schema)
+        if columns is not None:
+            empty_table = empty_table.select(columns)
+        return empty_table.to_pandas()
     except pa.ArrowIOError as err_io:
         raise err_io
     except pa.ArrowInvalid as err_invalid:
         raise err_invalid
-
-    try:
-        table_info.check_dataframe(records)
     except KeyError as err_mismatch:
         raise err_mismatch
+    except pa.ArrowNotImplementedError as err_not_implemented:
+        raise TypeError(
+            f"{err_not_implemented}: Filter {filter_expression} not supported."
+        )
+
+    if columns is None:
+        try:
+            table_info.check_dataframe(records)
+        except KeyError as err_mismatch:
+            raise err_mismatch
 
     return records
+
+
+def _find_records_file_(table_info: TableInfo) -> Tuple[str, str]:
+    """
+    Internal function to find the file that holds a table's records.
+
+    Before a table's file_format changed from Parquet, its records were saved in a Parquet file.
+    That file holds the table's records until the table is written in its new format.
+
+    Args-
+        table_info (TableInfo): Object with schema and table details.
+
+    Returns-
+        Tuple[str, str]: Path of the file, and its storage format.
+    """
+    path = _convert_parquet_name_to_path_(table_info.name, table_info.file_format)
+    if table_info.file_format != "parquet" and not os.path.exists(path):
+        parquet_path = _convert_parquet_name_to_path_(table_info.name, "parquet")
+        if os.path.exists(parquet_path):
+            return parquet_path, "parquet"
+    return path, table_info.file_format
+
+
+def _load_cached_table_(table_info: TableInfo, path: str, file_format: str) -> pa.Table:
+    """
+    Internal function to get all validated records of a table that sets cache_records.
+
+    The file is only read if it has changed since its records were cached.
+
+    Args-
+        table_info (TableInfo): Object with schema and table details.
+        path (str): Path of the table's file.
+        file_format (str): Storage format of the file, "parquet" or "feather".
+
+    Returns-
+        pa.Table: All records in the file.
+
+    Raises-
+        FileNotFoundError: The file does not exist.
+        pyarrow.ArrowInvalid: File format is invalid.
+        pyarrow.ArrowIOError: I/O error occurs.
+        KeyError: File columns do not match schema.
+        TypeError: File column types can't be converted to the schema's types.
+    """
+    file_stat = os.stat(path)
+    file_version = (file_stat.st_mtime_ns, file_stat.st_size)
+    cached = _RECORDS_CACHE_.get(path)
+    if cached is not None and cached[0] == file_version:
+        return cached[1]
+    table = _read_table_(path, file_format)
+    if _has_older_types_(table.schema, table_info):
+        table = _convert_table_(table, table_info)
+    table_info.check_dataframe(table.to_pandas())
+    _RECORDS_CACHE_[path] = (file_version, table)
+    return table
+
+
+def _has_older_types_(file_schema: pa.Schema, table_info: TableInfo) -> bool:
+    """
+    Internal function to check if a file was written with older types for the table's columns.
+
+    Args-
+        file_schema (pa.Schema): The schema the file was written with.
+        table_info (TableInfo): Object with schema and table details.
+
+    Returns-
+        bool: True if the file has the table's columns, but any of them has a different type.
+    """
+    return (
+        file_schema.names == table_info.schema.names
+        and file_schema.types != table_info.schema.types
+    )
+
+
+def _convert_table_(table: pa.Table, table_info: TableInfo) -> pa.Table:
+    """
+    Internal function to convert records read from a file with older types to the table's schema.
+
+    For example, service log entry times saved as date64 are converted to timestamps.
+    The file itself is converted the next time the table is written.
+
+    Args-
+        table (pa.Table): Records with the table's columns, read from a file.
+        table_info (TableInfo): Object with schema and table details.
+
+    Returns-
+        pa.Table: The records, with the types of the table's schema.
+
+    Raises-
+        pyarrow.ArrowInvalid: A value can't be represented in its column's new type.
+        TypeError: A column's older type can't be converted to its new type.
+    """
+    try:
+        return table.cast(table_info.schema)
+    except pa.ArrowNotImplementedError as err_not_implemented:
+        raise TypeError(
+            f"{err_not_implemented}: {table_info.name} records can't be converted to its schema."
+        )
+
+
+def _select_records_(
+    table: pa.Table,
+    columns: Optional[List[str]] = None,
+    filter_expression: Optional[pc.Expression] = None,
+) -> pa.Table:
+    """
+    Internal function to apply a load's filter and column selection to records in memory.
+
+    Args-
+        table (pa.Table): Records to select from.
+        columns (Optional[List[str]]): Columns to keep, or None to keep all columns.
+        filter_expression (Optional[pc.Expression]):
+            Only keep records matching this expression, or None to keep all records.
+
+    Returns-
+        pa.Table: The selected records.
+    """
+    if filter_expression is not None:
+        table = table.filter(filter_expression)
+    if columns is not None:
+        table = table.select(columns)
+    return table
+
+
+def _read_table_(
+    path: str,
+    file_format: str,
+    columns: Optional[List[str]] = None,
+    filter_expression: Optional[pc.Expression] = None,
+) -> pa.Table:
+    """
+    Internal function to read a Parquet or Feather file into an Arrow table.
+
+    Args-
+        path (str): Path of the file to read.
+        file_format (str): Storage format of the file, "parquet" or "feather".
+        columns (Optional[List[str]]): Columns to read, or None to read all columns.
+        filter_expression (Optional[pc.Expression]):
+            Only read records matching this expression, or None to read all records.
+
+    Files are memory-mapped rather than read into a buffer first. Files are only ever replaced,
+    never written in place, so a mapping stays valid after the file is rewritten.
+
+    Returns-
+        pa.Table: The contents of the file.
+
+    Raises-
+        FileNotFoundError: The file does not exist.
+        pyarrow.ArrowInvalid: File format is invalid.
+        pyarrow.ArrowIOError: I/O error occurs.
+    """
+    if file_format == "feather":
+        if filter_expression is None:
+            return feather.read_table(path, columns=columns, memory_map=True)
+        return ds.dataset(
+            path, format="feather", filesystem=_MMAP_FILESYSTEM_
+        ).to_table(columns=columns, filter=filter_expression)
+    return pq.read_table(
+        path, columns=columns, filters=filter_expression, memory_map=True
+    )
+
+
+def _read_file_schema_(path: str, file_format: str) -> pa.Schema:
+    """
+    Internal function to read the schema of a Parquet or Feather file, without its records.
+
+    Schemas are cached until the file's modification time or size changes.
+
+    Args-
+        path (str): Path of the file to read.
+        file_format (str): Storage format of the file, "parquet" or "feather".
+
+    Returns-
+        pa.Schema: The schema the file was written with.
+
+    Raises-
+        FileNotFoundError: The file does not exist.
+        pyarrow.ArrowInvalid: File format is invalid.
+        pyarrow.ArrowIOError: I/O error occurs.
+    """
+    file_stat = os.stat(path)
+    return _read_file_schema_version_(
+        path, file_format, file_stat.st_mtime_ns, file_stat.st_size
+    )
+
+
+@lru_cache(maxsize=16)
+def _read_file_schema_version_(
+    path: str, file_format: str, mtime_ns: int, size: int
+) -> pa.Schema:
+    """
+    Internal function to read the schema of one version of a Parquet or Feather file.
+
+    Args-
+        path (str): Path of the file to read.
+        file_format (str): Storage format of the file, "parquet" or "feather".
+        mtime_ns (int): Modification time of the file, used only as part of the cache key.
+        size (int): Size of the file, used only as part of the cache key.
+
+    Returns-
+        pa.Schema: The schema the file was written with.
+
+    Raises-
+        FileNotFoundError: The file does not exist.
+        pyarrow.ArrowInvalid: File format is invalid.
+        pyarrow.ArrowIOError: I/O error occurs.
+    """
+    if file_format == "feather":
+        return pa.ipc.open_file(path).schema
+    return pq.read_schema(path)
@@ -0,0 +1,132 @@
+"""Buffer for adding many records to a database file in batches."""
+from typing import Any, Dict, List, Set
+import pandas as pd
+import pyarrow as pa
+from .edit_records import add_records_to_file
+from ..schemas import TableInfo
+
+# Number of buffered records that triggers a write to the file.
+_DEFAULT_BATCH_SIZE_ = 8192
+
+
+class RecordBuffer:
+    """
+    Collects records for one table in memory, and adds them to its file in batches.
+
+    Each write to a database file rewrites the whole file, so adding records one at a time
+    costs a full read and write per record. Buffered records are written together when the
+    buffer fills up or when flush() is called.
+
+    Examples-
+        service_log = RecordBuffer(SERVICE_LOG_INFO)
+        try:
+            for record in records:
+                service_log.append(record)
+        finally:
+            service_log.flush()
+    """
+
+    def __init__(
+        self, table_info: TableInfo, batch_size: int = _DEFAULT_BATCH_SIZE_
+    ) -> None:
+        """
+        Create an empty buffer for a table.
+
+        Args-
+            table_info (TableInfo): Object with schema and table details.
+            batch_size (int): Number of buffered records that triggers a write to the file.
+        """
+        self.table_info = table_info
+        self.batch_size = batch_size
+        self._columns = self._empty_columns()
+        # Index values of the buffered records, to reject duplicates before they are buffered.
+        self._index_values: Set[Any] = set()
+
+    def __len__(self) -> int:
+        """Number of records waiting to be written."""
+        return len(self._columns[self.table_info.index_col()])
+
+    def check_record(self, record: Dict[str, Any]) -> None:
+        """
+        Check that a record can be added to the buffer.
+
+        Args-
+            record (Dict[str, Any]): Value of each field in the record.
+
+        Raises-
+            KeyError: Mismatch between the record's fields and the schema.
+            TypeError: Type mismatch between the schema & record.
+            ArithmeticError: Value exceeds a character or numeric limit set by table_info.
+            ValueError: The record's index value is already in the buffer.
+        """
+        self.table_info.check_columns(list(record.keys()))
+        for field_name, value in record.items():
+            self.table_info.check_field(value, field_name)
+        if record[self.table_info.index_col()] in self._index_values:
+            raise ValueError("Record duplicates a buffered record in the index column.")
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Validate a record and add it to the buffer, writing the buffer if it is full.
+
+        Invalid records are rejected before they are buffered.
+
+        Args-
+            record (Dict[str, Any]): Value of each field in the record.
+
+        Raises-
+            KeyError: Mismatch between the record's fields and the schema.
+            TypeError: Type mismatch between the schema & record.
+            ArithmeticError: Value exceeds a character or numeric limit set by table_info.
+            ValueError:
+                The record's index value is already in the buffer, or written records result
+                in duplicate entries in the index column.
+            pyarrow.ArrowInvalid: The table's file format is invalid.
+            pyarrow.ArrowIOError: I/O error occurs while writing a full buffer.
+        """
+        self.check_record(record)
+
+        for field_name, values in self._columns.items():
+            values.append(record[field_name])
+        self._index_values.add(record[self.table_info.index_col()])
+        if len(self) >= self.batch_size:
+            try:
+                self.flush()
+            except pa.ArrowInvalid as err_invalid:
+                raise err_invalid
+            except pa.ArrowIOError as err_io:
+                raise err_io
+            except ValueError as err_duplicate:
+                raise err_duplicate
+
+    def flush(self) -> None:
+        """
+        Add all buffered records to the table's file, then empty the buffer.
+
+        Records stay in the buffer if they can't be written, so that flush can be retried.
+
+        Raises-
+            ValueError: Written records result in duplicate entries in the index column.
+            pyarrow.ArrowInvalid: The table's file format is invalid.
+            pyarrow.ArrowIOError: I/O error occurs.
+        """
+        if len(self) == 0:
+            return
+        try:
+            add_records_to_file(pd.DataFrame(self._columns), self.table_info)
+        except pa.ArrowInvalid as err_invalid:
+            raise err_invalid
+        except pa.ArrowIOError as err_io:
+            raise err_io
+        except ValueError as err_duplicate:
+            raise err_duplicate
+        self.clear()
+
+    def clear(self) -> None:
+        """Empty the buffer, without writing its records."""
+        self._columns = self._empty_columns()
+        self._index_values = set()
+
+    def _empty_columns(self) -> Dict[str, List[Any]]:
+        """Create an empty list of values for each column in the schema."""
+        return {field_name: [] for field_name in self.table_info.schema.names}
@@ -2,8 +2,12 @@
 from importlib.resources import files
 import os
 from datetime import date
+from typing import Optional
 from dateutil.tz import tzlocal
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
 
 # Directory where report files are stored.
 _REPORT_DIR_ = str(files("choc_an_simulator") / "reports")
@@ -13,13 +17,17 @@ DTTM_FMT = "%m-%d-%Y %H:%M"
 DATE_FMT = "%m-%d-%Y"
 
 
-def save_report(table: pd.DataFrame, file_name: str) -> str:
+def save_report(table: pd.DataFrame, file_name: str, arrow_writer: bool = False) -> str:
     """
     Save a DataFrame to a CSV file, converting dates and datetimes to local time strings.
 
     Args-
         table (pd.DataFrame): Data to be saved.
         file_name (str): Name of the file (without directory or extension) to save the report.
+        arrow_writer (bool):
+            Write the file with Arrow's CSV writer, which is faster for large tables.
+            Its CSV quotes the header and every string, and writes whole floats without ".0".
+            Tables Arrow can't write, like ones with list columns, are written by pandas.
 
     Returns-
         str: Full path where the report was saved.
@@ -29,14 +37,40 @@ def save_report(table: pd.DataFrame, file_name: str) -> str:
     """
     path = _convert_report_name_to_path_(file_name)
     table = _convert_datetimes_to_formatted_str(table)
+    arrow_table = _to_arrow_table(table) if arrow_writer else None
     try:
-        table.to_csv(path, index=False)
+        if arrow_table is None:
+            table.to_csv(path, index=False)
+        else:
+            pa_csv.write_csv(arrow_table, path)
     except IOError as err_io:
         raise err_io
 
     return path
 
 
+def _to_arrow_table(table: pd.DataFrame) -> Optional[pa.Table]:
+    """
+    Convert a report to an Arrow table, so it can be written by Arrow's CSV writer.
+
+    Args-
+        table (pd.DataFrame): Report to convert.
+
+    Returns-
+        pa.Table: The converted report.
+        None: The report has columns Arrow can't write to CSV, like mixed types or lists.
+    """
+    try:
+        arrow_table = pa.Table.from_pandas(table, preserve_index=False)
+    except pa.ArrowInvalid:
+        return None
+    except pa.ArrowTypeError:
+        return None
+    if any(pa.types.is_nested(col_type) for col_type in arrow_table.schema.types):
+        return None
+    return arrow_table
+
+
 def _convert_datetimes_to_formatted_str(table: pd.DataFrame) -> pd.DataFrame:
     """
     Convert each date and datetime column to a column of formatted strings.
@@ -51,17 +85,44 @@ def _convert_datetimes_to_formatted_str(table: pd.DataFrame) -> pd.DataFrame:
     for col_name, col_dtype in table.dtypes.items():
         # Convert all dates to strings
         if str(col_dtype) == "object":
-            table[col_name] = table[col_name].apply(
-                lambda val: val.strftime(DATE_FMT) if isinstance(val, date) else val
-            )
+            table[col_name] = _convert_dates_to_formatted_str(table[col_name])
         # Convert all timezone-aware datetimes to local time
-        elif str(col_dtype).startswith("datetime64[ns, "):
+        elif isinstance(col_dtype, pd.DatetimeTZDtype):
             table[col_name] = (
                 table[col_name].dt.tz_convert(tzlocal()).dt.strftime(DTTM_FMT)
             )
     return table
 
 
+def _convert_dates_to_formatted_str(column: pd.Series) -> pd.Series:
+    """
+    Convert the dates in an object column to formatted strings.
+
+    Columns holding only dates (and nulls) are formatted in one pass by Arrow. Columns with
+    mixed values are converted one value at a time, leaving values that aren't dates as-is.
+
+    Args-
+        column (pd.Series): Column to convert.
+
+    Returns-
+        pd.Series: The converted column.
+    """
+    try:
+        values = pa.array(column, from_pandas=True)
+    except pa.ArrowInvalid:
+        values = None
+    except pa.ArrowTypeError:
+        values = None
+    if values is None:
+        return column.apply(
+            lambda val: val.strftime(DATE_FMT) if isinstance(val, date) else val
+        )
+    if pa.types.is_date(values.type) or pa.types.is_timestamp(values.type):
+        formatted = pc.strftime(values, format=DATE_FMT)
+        return pd.Series(formatted.to_pylist(), index=column.index, dtype=object)
+    return column
+
+
 def _convert_report_name_to_path_(name: str) -> str:
     """
     Internal function to convert a file name to a full path for CSV files.
@@ -75,7 +75,7 @@ def secure_password_verification(user_id: int, password: str) -> bool:
         pw = load_records_from_file(USER_INFO, eq_cols={"id": user_id})
         if pw.empty:
             return False
-        pw = pw["password_hash"].iloc[0]
+        pw = pw["password_hash"].iat[0]
     except pa.ArrowIOError as err_io:
         PColor.pwarn(f"There was an issue accessing the database.\n\tError: {err_io}")
         return False
@@ -98,4 +98,4 @@ def user_type_authorization(user_id: int) -> int:
         PColor.pwarn(f"There was an issue accessing the database.\n\tError: {err_io}")
         return False
 
-    return user_type.iloc[0]
+    return user_type.iat[0]
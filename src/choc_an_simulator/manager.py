@@ -3,6 +3,7 @@ Manager Sub-System.
 
 The manager sub-system allows managers to manage member, provider, and provider directory records.
 """
+import re
 import pandas as pd
 from pyarrow import ArrowIOError
 from pandas.api.types import is_numeric_dtype
@@ -21,6 +22,28 @@ from .report import (
     generate_provider_report,
 )
 
+# Two letter state abbreviation, e.g. "OR".
+_STATE_RE = re.compile(r"[A-Z]{2}")
+
+
+def _id_limit(char_limit: range) -> range:
+    """
+    Get the numeric limit of IDs with a fixed number of digits.
+
+    Args-
+        char_limit (range): Character limit of the ID, with the same start and stop.
+
+    Returns-
+        range: Smallest and largest ID, inclusive like all limits in prompt_int.
+    """
+    return range(10 ** (char_limit.start - 1), 10**char_limit.stop - 1)
+
+
+# Limits checked by the ID prompts, so IDs with the wrong number of digits are rejected.
+_MEMBER_ID_LIMIT = _id_limit(MEMBER_INFO.character_limits["member_id"])
+_USER_ID_LIMIT = _id_limit(USER_INFO.character_limits["id"])
+_SERVICE_ID_LIMIT = _id_limit(PROVIDER_DIRECTORY_INFO.character_limits["service_id"])
+
 
 def manager_menu() -> None:
     """
@@ -172,22 +195,20 @@ def add_member_record() -> None:
         )
         return
 
-    member_df = pd.DataFrame(
-        {
-            "member_id": member_id,
-            "name": prompt_str("Name", MEMBER_INFO.character_limits["name"]),
-            "address": prompt_str("Address", MEMBER_INFO.character_limits["address"]),
-            "city": prompt_str("City", MEMBER_INFO.character_limits["city"]),
-            "state": prompt_str("State", MEMBER_INFO.character_limits["state"]),
-            "zipcode": prompt_int("Zipcode", MEMBER_INFO.character_limits["zipcode"]),
-            "suspended": False,
-        },
-        index=[0],
-    )
-    if member_df.isna().values.any():
+    member_fields = {
+        "member_id": member_id,
+        "name": prompt_str("Name", MEMBER_INFO.character_limits["name"]),
+        "address": prompt_str("Address", MEMBER_INFO.character_limits["address"]),
+        "city": prompt_str("City", MEMBER_INFO.character_limits["city"]),
+        "state": prompt_str("State", MEMBER_INFO.character_limits["state"], _STATE_RE),
+        "zipcode": prompt_int("Zipcode", MEMBER_INFO.character_limits["zipcode"]),
+        "suspended": False,
+    }
+    if any(value is None for value in member_fields.values()):
         return
+    member_record = pd.DataFrame(member_fields, index=[0])
     try:
-        add_records_to_file(member_df, MEMBER_INFO)
+        add_records_to_file(member_record, MEMBER_INFO)
     except ArrowIOError:
         PColor.pwarn("There was an issue accessing the database. Member was not added.")
         return
@@ -202,11 +223,11 @@ def update_member_record() -> None:
     This prompt repeats until the user chooses to exit.
     """
     try:
-        member_id = prompt_int("Member ID")
+        member_id = prompt_int("Member ID", numeric_limit=_MEMBER_ID_LIMIT)
         if member_id is None:
             return
         member_record = load_records_from_file(
-            MEMBER_INFO, eq_cols={"member_id": member_id}
+            MEMBER_INFO, eq_cols={"member_id": member_id}, columns=["member_id"]
         )
     except ArrowIOError:
         PColor.pwarn("There was an error loading the member record.")
@@ -216,11 +237,8 @@ def update_member_record() -> None:
         PColor.pwarn("Warning: No matching member.\n")
         return
 
-    member_record = member_record.iloc[0]
-
-    options = []
-    for field in member_record.index.values[1:]:
-        options.append(field)
+    # Every field except the member ID can be changed.
+    options = MEMBER_INFO.schema.names[1:]
     selection = prompt_menu_options("Choose field to change", options)
     if selection is None:
         return
@@ -229,6 +247,12 @@ def update_member_record() -> None:
         new_value = prompt_int(
             f"New value for {field_to_update}", MEMBER_INFO.character_limits["zipcode"]
         )
+    elif field_to_update == "state":
+        new_value = prompt_str(
+            f"New value for {field_to_update}",
+            MEMBER_INFO.character_limits["state"],
+            _STATE_RE,
+        )
     else:
         new_value = prompt_str(
             f"New value for {field_to_update}", MEMBER_INFO.character_limits["address"]
@@ -263,7 +287,7 @@ def remove_member_record() -> None:
     # except ArrowIOError:
     #     PColor.pfail("Member was not removed!")
     #     return
-    member_id = prompt_int("Member ID")
+    member_id = prompt_int("Member ID", numeric_limit=_MEMBER_ID_LIMIT)
     if member_id is None:
         return
     try:
@@ -290,7 +314,7 @@ def generate_unique_id(table_info: TableInfo) -> int:
     """
     df = None
     try:
-        df = load_records_from_file(table_info)
+        df = load_records_from_file(table_info, columns=[table_info.index_col()])
     except ArrowIOError:
         PColor.pwarn(
             "There was an issue accessing the database."
@@ -326,23 +350,21 @@ def add_provider_record() -> None:
         PColor.pfail("The maximum number of users has been reached. No new user added.")
         return
 
-    provider_df = pd.DataFrame(
-        {
-            "id": provider_id,
-            "type": 1,
-            "name": prompt_str("Name", USER_INFO.character_limits["name"]),
-            "address": prompt_str("Address", USER_INFO.character_limits["address"]),
-            "city": prompt_str("City", USER_INFO.character_limits["city"]),
-            "state": prompt_str("State", USER_INFO.character_limits["state"]),
-            "zipcode": prompt_int("Zipcode", USER_INFO.character_limits["zipcode"]),
-            "password_hash": bytes(0),
-        },
-        index=[0],
-    )
-    if provider_df.isna().values.any():
+    provider_fields = {
+        "id": provider_id,
+        "type": 1,
+        "name": prompt_str("Name", USER_INFO.character_limits["name"]),
+        "address": prompt_str("Address", USER_INFO.character_limits["address"]),
+        "city": prompt_str("City", USER_INFO.character_limits["city"]),
+        "state": prompt_str("State", USER_INFO.character_limits["state"], _STATE_RE),
+        "zipcode": prompt_int("Zipcode", USER_INFO.character_limits["zipcode"]),
+        "password_hash": bytes(0),
+    }
+    if any(value is None for value in provider_fields.values()):
         return
+    provider_record = pd.DataFrame(provider_fields, index=[0])
     try:
-        add_records_to_file(provider_df, USER_INFO)
+        add_records_to_file(provider_record, USER_INFO)
     except ArrowIOError:
         PColor.pwarn(
             "There was an issue accessing the database. Provider was not added."
@@ -358,7 +380,7 @@ def update_provider_record() -> None:
 
     Prompts the user for a provider ID, then prompts for which field to change.
     """
-    provider_id = prompt_int("Provider ID")
+    provider_id = prompt_int("Provider ID", numeric_limit=_USER_ID_LIMIT)
     if provider_id is None:
         return None
     try:
@@ -382,6 +404,12 @@ def update_provider_record() -> None:
         new_value = prompt_int(
             f"New value for {field_to_update}", USER_INFO.character_limits["zipcode"]
         )
+    elif field_to_update == "state":
+        new_value = prompt_str(
+            f"New value for {field_to_update}",
+            USER_INFO.character_limits["state"],
+            _STATE_RE,
+        )
     else:
         new_value = prompt_str(
             f"New value for {field_to_update}", USER_INFO.character_limits["address"]
@@ -416,7 +444,7 @@ def remove_provider_record() -> None:
     # except ArrowIOError:
     #     PColor.pfail("Provider was not removed!")
     #     return
-    provider_id = prompt_int("Provider ID")
+    provider_id = prompt_int("Provider ID", numeric_limit=_USER_ID_LIMIT)
     try:
         result = remove_record(provider_id, USER_INFO)
     except ArrowIOError:
@@ -443,24 +471,22 @@ def add_provider_directory_record() -> None:
         )
         return
 
-    service_df = pd.DataFrame(
-        {
-            "service_id": service_id,
-            "service_name": prompt_str(
-                "Service name", PROVIDER_DIRECTORY_INFO.character_limits["service_name"]
-            ),
-            "price_dollars": prompt_int("Price (dollars)"),
-            "price_cents": prompt_int(
-                "Price (cents)",
-                numeric_limit=PROVIDER_DIRECTORY_INFO.numeric_limits["price_cents"],
-            ),
-        },
-        index=[0],
-    )
-    if service_df.isna().values.any():
+    service_fields = {
+        "service_id": service_id,
+        "service_name": prompt_str(
+            "Service name", PROVIDER_DIRECTORY_INFO.character_limits["service_name"]
+        ),
+        "price_dollars": prompt_int("Price (dollars)"),
+        "price_cents": prompt_int(
+            "Price (cents)",
+            numeric_limit=PROVIDER_DIRECTORY_INFO.numeric_limits["price_cents"],
+        ),
+    }
+    if any(value is None for value in service_fields.values()):
         return
+    service_record = pd.DataFrame(service_fields, index=[0])
     try:
-        add_records_to_file(service_df, PROVIDER_DIRECTORY_INFO)
+        add_records_to_file(service_record, PROVIDER_DIRECTORY_INFO)
     except ArrowIOError:
         PColor.pwarn(
             "There was an issue accessing the database. Service was not added."
@@ -472,7 +498,7 @@ def add_provider_directory_record() -> None:
 
 def update_provider_directory_record() -> None:
     """The manager is prompted for a service id and then the service is updated based on the id."""
-    service_id = prompt_int("Service ID")
+    service_id = prompt_int("Service ID", numeric_limit=_SERVICE_ID_LIMIT)
     if service_id is None:
         return None
     try:
@@ -518,7 +544,7 @@ def update_provider_directory_record() -> None:
 
 def remove_provider_directory_record() -> None:
     """Manager is prompted for a service id, and a lookup is performed, and a service is removed."""
-    service_id = prompt_int("Service ID")
+    service_id = prompt_int("Service ID", numeric_limit=_SERVICE_ID_LIMIT)
     result = None
     try:
         result = remove_record(service_id, PROVIDER_DIRECTORY_INFO)
@@ -6,17 +6,117 @@ It encompasses functions for displaying menus, prompting for member IDs, recordi
 billing entries, and managing provider directories. These functions collectively support
 billing, service verification, and data retrieval processes in the ChocAn system.
 """
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Set, Tuple
 from pyarrow import ArrowIOError
 from .database_management import (
     load_records_from_file,
     save_report,
     add_records_to_file,
+    RecordBuffer,
 )
-from datetime import datetime
+from datetime import datetime, timezone
 from .schemas import PROVIDER_DIRECTORY_INFO, MEMBER_INFO, SERVICE_LOG_INFO, USER_INFO
 from .user_io import prompt_menu_options, PColor, prompt_int, prompt_date, prompt_str
 import pandas as pd
 
+# Answers that confirm a service, in lower case.
+_YES = frozenset(("y", "yes"))
+# Options shown in the provider menu.
+_PROVIDER_MENU = ("Request Provider Directory", "Record a Service", "Member Check-In")
+# Number of invalid member IDs remembered during a provider session.
+_MAX_INVALID_MEMBER_IDS = 1024
+# Number of service entries recorded during a provider session that are written together.
+# Entries are also written when the provider leaves the menu.
+_SERVICE_LOG_BATCH_SIZE = 10
+# Errors raised when service entries are invalid, or don't fit the service log file.
+# Unlike I/O errors, retrying doesn't fix them.
+_INVALID_SERVICE_LOG_ERRORS = (ValueError, TypeError, KeyError, ArithmeticError)
+
+
+class ProviderDirectoryCache:
+    """
+    Services in the provider directory, loaded on first use and kept for a provider session.
+
+    The provider directory isn't changed during a provider session, so it only needs to be
+    loaded once no matter how many services are recorded.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty cache. The provider directory is loaded by the first lookup."""
+        self._services: Optional[Dict[int, Tuple[str, int, int]]] = None
+
+    def get(self, service_id: int) -> Optional[Tuple[str, int, int]]:
+        """
+        Look up a service by its ID.
+
+        Args-
+            service_id (int): ID of the service to look up.
+
+        Returns-
+            Tuple[str, int, int]: The service's name, price in dollars and remaining cents.
+            None: No service with the given ID exists.
+
+        Raises-
+            pyarrow.ArrowIOError: I/O error occurs while loading the provider directory.
+        """
+        if self._services is None:
+            try:
+                services_df = load_records_from_file(
+                    PROVIDER_DIRECTORY_INFO,
+                    columns=[
+                        "service_id",
+                        "service_name",
+                        "price_dollars",
+                        "price_cents",
+                    ],
+                )
+            except ArrowIOError as err_io:
+                raise err_io
+            self._services = dict(
+                zip(
+                    services_df["service_id"].tolist(),
+                    zip(
+                        services_df["service_name"].tolist(),
+                        services_df["price_dollars"].tolist(),
+                        services_df["price_cents"].tolist(),
+                    ),
+                )
+            )
+        return self._services.get(service_id)
+
+
+class InvalidMemberCache:
+    """
+    Member IDs found to be invalid during a provider session, so they can be rejected again
+    without reading the member file.
+
+    Only the most recently added IDs are kept, up to _MAX_INVALID_MEMBER_IDS.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty cache."""
+        self._ids: Set[int] = set()
+        self._order: Deque[int] = deque()
+
+    def __contains__(self, member_id: int) -> bool:
+        """Whether the member ID was found to be invalid."""
+        return member_id in self._ids
+
+    def add(self, member_id: int) -> None:
+        """
+        Remember that a member ID is invalid, forgetting the oldest ID if the cache is full.
+
+        Args-
+            member_id (int): The invalid member ID.
+        """
+        if member_id in self._ids:
+            return
+        if len(self._order) >= _MAX_INVALID_MEMBER_IDS:
+            self._ids.discard(self._order.popleft())
+        self._ids.add(member_id)
+        self._order.append(member_id)
+
 
 def show_provider_menu() -> None:
     """
@@ -24,42 +124,101 @@ def show_provider_menu() -> None:
 
     Present the provider with a range of menu options, allowing access to various functionalities
     of the Provider Component, like requesting the provider directory or recording service entries.
+
+    Confirmed service entries are kept for the session, and written to the service log together
+    each time the batch fills up, and when the provider exits the menu. Entries that fail to be
+    written because of an I/O error are kept, and retried by the next write. The provider
+    directory is loaded once per session.
     """
-    user_exit = False
-    while user_exit is False:
-        match prompt_menu_options(
-            "Provider Menu",
-            ["Request Provider Directory", "Record a Service", "Member Check-In"],
-        ):
-            case (_, "Request Provider Directory"):
-                request_provider_directory()
-            case (_, "Record a Service"):
-                record_service_billing_entry()
-            case (_, "Member Check-In"):
-                check_in_member()
-            case None:
-                user_exit = True
-
-
-def check_in_member() -> None:
+    service_log = RecordBuffer(SERVICE_LOG_INFO, batch_size=_SERVICE_LOG_BATCH_SIZE)
+    service_directory = ProviderDirectoryCache()
+    invalid_members = InvalidMemberCache()
+    # Functions are looked up when called, so each option reaches the module's current function.
+    menu_actions = {
+        "Request Provider Directory": lambda: request_provider_directory(),
+        "Record a Service": lambda: record_service_billing_entry(
+            service_log, service_directory
+        ),
+        "Member Check-In": lambda: check_in_member(invalid_members),
+    }
+    try:
+        while True:
+            selection = prompt_menu_options("Provider Menu", _PROVIDER_MENU)
+            if selection is None:
+                break
+            menu_actions[selection[1]]()
+    finally:
+        pending_entries = len(service_log)
+        if _write_service_log(service_log, service_log.flush):
+            if pending_entries > 0:
+                PColor.pok(
+                    f"{pending_entries} service entries saved to the service log."
+                )
+        elif len(service_log) > 0:
+            PColor.pfail(f"{len(service_log)} service entries were not recorded.")
+
+
+def _write_service_log(service_log: RecordBuffer, write: Callable[[], None]) -> bool:
+    """
+    Write to the service log from its buffer, and display any errors.
+
+    Entries that fail to be written because of an I/O error stay in the buffer, to be retried by
+    the next write. Other errors, like a service log file that doesn't match its schema, fail
+    again on every retry, so the buffered entries are discarded.
+
+    Args-
+        service_log (RecordBuffer): Buffer of service entries.
+        write (Callable[[], None]): Function that writes the buffer, like service_log.flush.
+
+    Returns-
+        bool: True if the write succeeded.
+    """
+    try:
+        write()
+    except ArrowIOError as e:
+        PColor.pfail("Failed to add service log information to the file")
+        PColor.pfail(f"An error occurred: {e}")
+        return False
+    except _INVALID_SERVICE_LOG_ERRORS as e:
+        PColor.pfail("Failed to add service log information to the file")
+        PColor.pfail(f"An error occurred: {e}")
+        PColor.pfail(f"{len(service_log)} service entries were discarded.")
+        service_log.clear()
+        return False
+    return True
+
+
+def check_in_member(invalid_members: Optional[InvalidMemberCache] = None) -> None:
     """
     Prompt for a member's ID and display their status.
 
     Initiates a prompt for the user to enter a member ID, which can be entered through a
     keycard reader or manually via the terminal. Then, displays either "Valid", "Suspended"
     or "Invalid"
+
+    Args-
+        invalid_members (Optional[InvalidMemberCache]):
+            Member IDs already found to be invalid this session, which are rejected without
+            reading the member file. Newly found invalid IDs are added to it.
     """
     member_id = prompt_int(
         "Please enter Member ID", char_limit=MEMBER_INFO.character_limits["member_id"]
     )
+    if member_id is None:
+        return
+    if invalid_members is not None and member_id in invalid_members:
+        PColor.pfail("Invalid")
+        return
 
     query_response = load_records_from_file(
-        table_info=MEMBER_INFO, eq_cols={"member_id": member_id}
+        table_info=MEMBER_INFO, eq_cols={"member_id": member_id}, columns=["suspended"]
     )
 
     if query_response.empty:
+        if invalid_members is not None:
+            invalid_members.add(member_id)
         PColor.pfail("Invalid")
-    elif query_response["suspended"].iloc[0]:
+    elif query_response["suspended"].iat[0]:
         PColor.pwarn("Suspended")
     else:
         PColor.pok("Valid")
@@ -78,35 +237,41 @@ def display_member_information() -> None:
     raise NotImplementedError("display_member_information")
 
 
-def record_service_billing_entry() -> None:
+def record_service_billing_entry(
+    service_log: Optional[RecordBuffer] = None,
+    service_directory: Optional[ProviderDirectoryCache] = None,
+) -> None:
     """
     Record a billing entry for a service provided to a member.
 
     In this function, the provider enters details of the service rendered. It involves
     validating the member's status, collecting service details, and saving the information
     in the service logs.
-    """
-    try:
-        members_df = load_records_from_file(MEMBER_INFO)
-    except ArrowIOError as e:
-        PColor.pfail("Failed to load member information from the file")
-        PColor.pfail(f"An error occurred: {e}")
-        return None
-
-    try:
-        providers_df = load_records_from_file(USER_INFO)
-    except ArrowIOError as e:
-        PColor.pfail("Failed to load user information from the file")
-        PColor.pfail(f"An error occurred: {e}")
-        return None
 
+    Args-
+        service_log (Optional[RecordBuffer]):
+            Buffer of the session's entries that haven't been written to the service log yet.
+            The entry is added to it, and written along with them when the buffer fills up.
+            If None, the entry is written immediately.
+        service_directory (Optional[ProviderDirectoryCache]):
+            Cached provider directory to look up the service in.
+            If None, the provider directory is loaded from the file.
+    """
     # Prompt for member ID and validate
     member_id = prompt_int(
         "Enter member ID", char_limit=MEMBER_INFO.character_limits["member_id"]
     )
     if member_id is None:
         return None
-    if member_id not in members_df["member_id"].values:
+    try:
+        member_df = load_records_from_file(
+            MEMBER_INFO, eq_cols={"member_id": member_id}, columns=["member_id"]
+        )
+    except ArrowIOError as e:
+        PColor.pfail("Failed to load member information from the file")
+        PColor.pfail(f"An error occurred: {e}")
+        return None
+    if member_df.empty:
         PColor.pfail("Invalid Member ID or Member Suspended")
         return None
 
@@ -116,7 +281,15 @@ def record_service_billing_entry() -> None:
     )
     if provider_id is None:
         return None
-    if provider_id not in providers_df["id"].values:
+    try:
+        provider_df = load_records_from_file(
+            USER_INFO, eq_cols={"id": provider_id, "type": 1}, columns=["id"]
+        )
+    except ArrowIOError as e:
+        PColor.pfail("Failed to load user information from the file")
+        PColor.pfail(f"An error occurred: {e}")
+        return None
+    if provider_df.empty:
         PColor.pfail("Invalid Provider ID")
         return None
 
@@ -133,24 +306,24 @@ def record_service_billing_entry() -> None:
     if service_code is None:
         return None
 
+    if service_directory is None:
+        service_directory = ProviderDirectoryCache()
     try:
-        services_df = load_records_from_file(PROVIDER_DIRECTORY_INFO)
+        service = service_directory.get(service_code)
     except ArrowIOError as e:
         PColor.pfail("Failed to load provider directory information from the file")
         PColor.pfail(f"An error occurred: {e}")
         return None
 
-    if service_code not in services_df["service_id"].values:
+    if service is None:
         PColor.pfail("Invalid Service Code")
         return None
+    service_name, price_dollars, price_cents = service
 
     # Display the service name and confirm
-    service_name = services_df[services_df["service_id"] == service_code][
-        "service_name"
-    ].iloc[0]
     PColor.pok(f"Service name: {service_name}")
     confirmation = prompt_str("Confirm service (yes/no)", char_limit=range(1, 3))
-    if confirmation and confirmation.lower() in ["y", "yes"]:
+    if confirmation and confirmation.lower() in _YES:
         PColor.pok("Service Confirmed")
     else:
         PColor.pfail("Service Not Confirmed")
@@ -162,33 +335,56 @@ def record_service_billing_entry() -> None:
         char_limit=SERVICE_LOG_INFO.character_limits["comments"],
     )
 
-    current_datetime = datetime.now()
+    current_datetime = datetime.now(timezone.utc)
 
     # Create record
-    record = pd.DataFrame(
-        {
-            "entry_datetime_utc": [current_datetime],
-            "service_date_utc": [service_date],
-            "provider_id": [provider_id],
-            "member_id": [member_id],
-            "service_id": [service_code],
-            "comments": [comments],
-        }
-    )
+    record = {
+        "entry_datetime_utc": current_datetime,
+        "service_date_utc": service_date,
+        "provider_id": provider_id,
+        "member_id": member_id,
+        "service_id": service_code,
+        "comments": comments,
+    }
 
     # Display Fee and Save to files
-    fee = services_df[services_df["service_id"] == service_code][
-        ["price_dollars", "price_cents"]
-    ]
-    PColor.pok(
-        f"Service Fee: ${fee['price_dollars'].iloc[0]}.{fee['price_cents'].iloc[0]:02d}"
-    )
-    try:
-        add_records_to_file(record, SERVICE_LOG_INFO)
+    PColor.pok(f"Service Fee: ${price_dollars}.{price_cents:02d}")
+    if service_log is None:
+        try:
+            add_records_to_file(pd.DataFrame([record]), SERVICE_LOG_INFO)
+        except ArrowIOError as e:
+            PColor.pfail("Failed to add service log information to the file")
+            PColor.pfail(f"An error occurred: {e}")
+            return None
+        except _INVALID_SERVICE_LOG_ERRORS as e:
+            PColor.pfail("Failed to add service log information to the file")
+            PColor.pfail(f"An error occurred: {e}")
+            return None
         PColor.pok("Service Billing Entry Recorded Successfully")
-    except ArrowIOError as e:
-        PColor.pfail("Failed to add service log information to the file")
+        return None
+
+    # Reject an invalid entry, so it can't stay in the buffer and fail every later write.
+    try:
+        service_log.check_record(record)
+    except _INVALID_SERVICE_LOG_ERRORS as e:
+        PColor.pfail("Invalid service entry, it was not recorded")
         PColor.pfail(f"An error occurred: {e}")
+        return None
+    # Buffer the entry, which writes every buffered entry once the buffer is full.
+    if not _write_service_log(service_log, lambda: service_log.append(record)):
+        if len(service_log) > 0:
+            PColor.pwarn(
+                "The entry will be retried with the next entry, or on leaving the menu."
+            )
+        return None
+    if len(service_log) == 0:
+        PColor.pok("Service Billing Entry Recorded Successfully")
+    else:
+        PColor.pok(
+            "Service Billing Entry Recorded. "
+            "It will be saved to the service log with the next batch of entries, "
+            "or on leaving the menu."
+        )
 
 
 def request_provider_directory() -> None:
@@ -200,7 +396,7 @@ def request_provider_directory() -> None:
         return
     try:
         provider_directory_report = save_report(
-            provider_directory_df, "provider_directory"
+            provider_directory_df, "provider_directory", arrow_writer=True
         )
     except IOError:
         PColor.pfail("There was an error saving the provider directory report.")
@@ -10,7 +10,9 @@ ChocAn members within the last 7 days.
 Summary reports are generated for all accounts payable this week
 """
 
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Tuple
 
 import pandas as pd
 import pyarrow as pa
@@ -25,6 +27,38 @@ from choc_an_simulator.schemas import (
 )
 from choc_an_simulator.user_io import PColor
 
+# Number of report files that are written at the same time.
+_REPORT_WRITERS = 8
+# Largest total fee for the week that can be reported, in cents ($99,999.99).
+_MAX_TOTAL_FEE_CENTS = 9_999_999
+# Columns of each member report, in order, and the label each is saved with.
+_MEMBER_REPORT_COLUMNS = {
+    "Name": "Name",
+    "member_id": "Member Number",
+    "address": "address",
+    "city": "city",
+    "state": "state",
+    "zipcode": "zipcode",
+    "Services": "Services",
+}
+# Columns of each provider report, in order, and the label each is saved with.
+_PROVIDER_REPORT_COLUMNS = {
+    "Provider Name": "Provider Name",
+    "provider_id": "Provider Number",
+    "address": "address",
+    "city": "city",
+    "state": "state",
+    "zipcode": "zipcode",
+    "service_date_utc": "Date of Service",
+    "entry_datetime_utc": "Date and Time Data Were Received by the Computer",
+    "Member Name": "Member Name",
+    "member_id": "Member Number",
+    "service_id": "Service Code",
+    "Fee to be paid": "Fee to be paid",
+    "Total number of consultations with members": "Total number of consultations with members",
+    "Total fee for the week": "Total fee for the week",
+}
+
 
 def generate_member_report() -> None:
     """
@@ -36,85 +70,97 @@ def generate_member_report() -> None:
     the order of the service date. After a report is generated, the path to it
     is printed to the console.
     """
-    gt_cols = {"service_date_utc": (datetime.now() - timedelta(days=7)).date()}
-    service_log = None
-    provider_directory = None
-    member_info = None
-    user_info = None
+    gt_cols = {"service_date_utc": _week_start()}
     service_log_cols = ["service_date_utc", "member_id", "provider_id", "service_id"]
     member_cols = ["member_id", "name", "address", "city", "state", "zipcode"]
     user_cols = ["name", "id"]
     provider_directory_cols = ["service_id", "service_name"]
 
     try:
-        service_log = load_records_from_file(SERVICE_LOG_INFO, gt_cols=gt_cols)
+        service_log = load_records_from_file(
+            SERVICE_LOG_INFO, gt_cols=gt_cols, columns=service_log_cols
+        )
         if service_log.empty:
             print("No records found within the last 7 days.")
             return
         service_log = service_log[service_log_cols]
-        member_info = load_records_from_file(MEMBER_INFO)[member_cols]
-        user_info = load_records_from_file(USER_INFO)[user_cols]
-        provider_directory = load_records_from_file(PROVIDER_DIRECTORY_INFO)[
-            provider_directory_cols
-        ]
+        member_info = load_records_from_file(
+            MEMBER_INFO,
+            columns=member_cols,
+            isin_cols={"member_id": service_log["member_id"].unique()},
+        )[member_cols]
+        user_info = load_records_from_file(
+            USER_INFO,
+            columns=user_cols,
+            isin_cols={"id": service_log["provider_id"].unique()},
+        )[user_cols]
+        provider_directory = load_records_from_file(
+            PROVIDER_DIRECTORY_INFO,
+            columns=provider_directory_cols,
+            isin_cols={"service_id": service_log["service_id"].unique()},
+        )[provider_directory_cols]
     except pa.ArrowIOError as err_io:
         PColor.pwarn(f"There was an issue accessing the database.\n\tError: {err_io}")
         return
 
-    merged_dfs = pd.merge(service_log, provider_directory, on="service_id")
-    merged_dfs = pd.merge(merged_dfs, user_info, left_on="provider_id", right_on="id")
-    merged_dfs = pd.merge(merged_dfs, member_info, on="member_id")
-    merged_dfs = merged_dfs.drop(columns="id")
-
-    # Create a new column storing a list of tuples containing the service date, service name, and
-    # provider name
-    merged_dfs["Services"] = list(
-        zip(
-            merged_dfs["service_date_utc"],
-            merged_dfs["service_name"],
-            merged_dfs["name_x"],
+    # Join each table on its key as an index, so the key lookups are built once per table
+    merged_dfs = (
+        service_log.join(
+            provider_directory.set_index("service_id"), on="service_id", how="inner"
         )
+        .join(
+            user_info.set_index("id").rename(columns={"name": "Provider Name"}),
+            on="provider_id",
+            how="inner",
+        )
+        .join(
+            member_info.set_index("member_id").rename(columns={"name": "Name"}),
+            on="member_id",
+            how="inner",
+        )
+        .reset_index(drop=True)
     )
-    agg_dict = {"Services": list}
-    # Group by member_id and aggregate the services column into a list
-    records = merged_dfs.groupby("member_id").agg(agg_dict).reset_index()
-    # Merge the original dataframe with the aggregated dataframe resulting in a new dataframe
-    # replaced the 3 service columns with the aggregated services column and is grouped by member_id
-    records = records.merge(
-        merged_dfs[
-            ["member_id", "name_y", "address", "city", "state", "zipcode"]
-        ].drop_duplicates(),
-        on="member_id",
-        how="left",
-    )
-    records = records.rename(
-        columns={
-            "name_y": "Name",
-            "member_id": "Member Number",
-            "name_x": "Provider Name",
-            "service_date_utc": "Service Date",
-        }
-    )
-    records = records[
-        ["Name", "Member Number", "address", "city", "state", "zipcode", "Services"]
-    ]
+    # Release the loaded tables once joined, so they aren't held while the report is built
+    del service_log, provider_directory, user_info, member_info
+    # Services whose member, provider, or service can't be found leave nothing to report
+    if merged_dfs.empty:
+        print("No records found within the last 7 days.")
+        return
 
-    # For each member, sort the services by date and then save the report and print the path to
-    # the console
-    for member_id in records["Member Number"]:
-        member_record = records[records["Member Number"] == member_id]
-        # member_record["Services"] = member_record["Services"].apply(lambda x: sorted(x))
-        member_record.loc[:, "Services"] = member_record.loc[:, "Services"].apply(
-            lambda x: sorted(
-                [
-                    (date, service_name, provider_name)
-                    for date, service_name, provider_name, in x
-                ]
+    # Sort the services once, so each member's services are already in order when grouped
+    merged_dfs = merged_dfs.sort_values(
+        ["service_date_utc", "service_name", "Provider Name"], kind="mergesort"
+    )
+    # Group the services by member, storing each member's services as a list of tuples
+    # containing the service date, service name, and provider name
+    records = (
+        merged_dfs.groupby(
+            ["member_id", "Name", "address", "city", "state", "zipcode"]
+        )[["service_date_utc", "service_name", "Provider Name"]]
+        .apply(
+            lambda services: list(
+                zip(
+                    services["service_date_utc"],
+                    services["service_name"],
+                    services["Provider Name"],
+                )
             )
         )
-        file_path = save_report(
-            member_record, f"{member_record['Name'].iloc[0]}_{_current_date()}"
-        )
+        .rename("Services")
+        .reset_index()
+    )
+    del merged_dfs
+    # Select and label the report's columns in one pass
+    records = records[list(_MEMBER_REPORT_COLUMNS)]
+    records.columns = list(_MEMBER_REPORT_COLUMNS.values())
+
+    # For each member, save the report and print the path to the console
+    report_date = _current_date()
+    member_reports = [
+        (member_record, f"{member_record['Name'].iloc[0]}_{report_date}")
+        for _, member_record in records.groupby("Member Number", sort=False)
+    ]
+    for file_path in _save_reports(member_reports):
         print(f"Member Report saved to {file_path}")
 
 
@@ -128,11 +174,7 @@ def generate_provider_report() -> None:
     be set to 999. If the total fee is greater than 99999.99, it will be set to 99999.99. After a
     report is generated, the path to it is printed to the console.
     """
-    gt_cols = {"service_date_utc": (datetime.now() - timedelta(days=7)).date()}
-    service_log = None
-    provider_directory = None
-    member_info = None
-    user_info = None
+    gt_cols = {"service_date_utc": _week_start()}
     service_log_cols = [
         "service_date_utc",
         "member_id",
@@ -145,86 +187,78 @@ def generate_provider_report() -> None:
     provider_directory_cols = ["service_id", "price_cents", "price_dollars"]
 
     try:
-        service_log = load_records_from_file(SERVICE_LOG_INFO, gt_cols=gt_cols)
+        service_log = load_records_from_file(
+            SERVICE_LOG_INFO, gt_cols=gt_cols, columns=service_log_cols
+        )
         if service_log.empty:
             print("No records found within the last 7 days.")
             return
         service_log = service_log[service_log_cols]
-        member_info = load_records_from_file(MEMBER_INFO)[member_cols]
-        user_info = load_records_from_file(USER_INFO)[user_cols]
-        provider_directory = load_records_from_file(PROVIDER_DIRECTORY_INFO)[
-            provider_directory_cols
-        ]
+        member_info = load_records_from_file(
+            MEMBER_INFO,
+            columns=member_cols,
+            isin_cols={"member_id": service_log["member_id"].unique()},
+        )[member_cols]
+        user_info = load_records_from_file(
+            USER_INFO,
+            columns=user_cols,
+            isin_cols={"id": service_log["provider_id"].unique()},
+        )[user_cols]
+        provider_directory = load_records_from_file(
+            PROVIDER_DIRECTORY_INFO,
+            columns=provider_directory_cols,
+            isin_cols={"service_id": service_log["service_id"].unique()},
+        )[provider_directory_cols]
     except pa.ArrowIOError as err_io:
         PColor.pwarn(f"There was an issue accessing the database.\n\tError: {err_io}")
         return
 
-    records = pd.merge(service_log, provider_directory, on="service_id")
-    records = pd.merge(records, user_info, left_on="provider_id", right_on="id")
-    records = pd.merge(records, member_info, on="member_id")
-    records["Fee to be paid"] = records["price_dollars"] + records["price_cents"] / 100
-    records = records.drop(columns=["id", "price_dollars", "price_cents"])
-
-    for provider_id in records["provider_id"].unique():
-        provider_record = records[records["provider_id"] == provider_id]
-        current_provider = records["provider_id"] == provider_id
-        # calculate_total_fee is broken out into a function to make it easier to mock for testing
-        total_fee = calculate_total_fee(provider_record["Fee to be paid"])
-        if total_fee < 99999.99:
-            records.loc[current_provider, "Total fee for the week"] = total_fee
-        else:
-            records.loc[current_provider, "Total fee for the week"] = 99999.99
-
-        # calculate_length_of_consultations is broken out into a function to make it easier to mock
-        # for testing
-        total_consultations = calculate_num_of_consultations(provider_record)
-        if total_consultations < 999:
-            records.loc[
-                current_provider, "Total number of consultations with members"
-            ] = total_consultations
-        else:
-            records.loc[
-                current_provider, "Total number of consultations with members"
-            ] = 999
-
-    records = records.rename(
-        columns={
-            "name_x": "Provider Name",
-            "provider_id": "Provider Number",
-            "name_y": "Member Name",
-            "member_id": "Member Number",
-            "service_date_utc": "Date of Service",
-            "entry_datetime_utc": "Date and Time Data Were Received by the Computer",
-            "service_id": "Service Code",
-        }
+    # Join each table on its key as an index, so the key lookups are built once per table
+    records = (
+        service_log.join(
+            provider_directory.set_index("service_id"), on="service_id", how="inner"
+        )
+        .join(
+            user_info.set_index("id").rename(columns={"name": "Provider Name"}),
+            on="provider_id",
+            how="inner",
+        )
+        .join(
+            member_info.set_index("member_id").rename(columns={"name": "Member Name"}),
+            on="member_id",
+            how="inner",
+        )
+        .reset_index(drop=True)
+    )
+    # Release the loaded tables once joined, so they aren't held while the report is built
+    del service_log, provider_directory, user_info, member_info
+    records["fee_cents"] = records["price_dollars"] * 100 + records["price_cents"]
+    records["Fee to be paid"] = records["fee_cents"] / 100
+
+    # Aggregate every provider's totals in one pass, then broadcast them to the provider's rows.
+    # calculate_total_fee and calculate_num_of_consultations are broken out into functions to
+    # make it easier to mock for testing
+    providers = records.groupby("provider_id", sort=False)
+    total_fees = providers["fee_cents"].apply(calculate_total_fee)
+    total_consultations = providers["fee_cents"].apply(calculate_num_of_consultations)
+    records["Total fee for the week"] = records["provider_id"].map(
+        _cap_total_fees(total_fees)
+    )
+    records["Total number of consultations with members"] = (
+        records["provider_id"].map(total_consultations.clip(upper=999)).astype(float)
     )
 
-    records = records[
-        [
-            "Provider Name",
-            "Provider Number",
-            "address",
-            "city",
-            "state",
-            "zipcode",
-            "Date of Service",
-            "Date and Time Data Were Received by the Computer",
-            "Member Name",
-            "Member Number",
-            "Service Code",
-            "Fee to be paid",
-            "Total number of consultations with members",
-            "Total fee for the week",
-        ]
-    ]
+    # Select and label the report's columns in one pass
+    records = records[list(_PROVIDER_REPORT_COLUMNS)]
+    records.columns = list(_PROVIDER_REPORT_COLUMNS.values())
 
     # For each provider save the report and print the path to the console
-    for provider_id in records["Provider Number"].unique():
-        provider_record = records[records["Provider Number"] == provider_id]
-        file_path = save_report(
-            provider_record,
-            f"{provider_record['Provider Name'].iloc[0]}_{_current_date()}",
-        )
+    report_date = _current_date()
+    provider_reports = [
+        (provider_record, f"{provider_record['Provider Name'].iloc[0]}_{report_date}")
+        for _, provider_record in records.groupby("Provider Number", sort=False)
+    ]
+    for file_path in _save_reports(provider_reports):
         print(f"Provider Report saved to {file_path}")
 
 
@@ -237,70 +271,58 @@ def generate_summary_report() -> None:
     provided services, the total number of consultations, and the overall fee total are
     printed.
     """
-    gt_cols = gt_cols = {"service_date_utc": (datetime.now() - timedelta(days=7)).date()}
-    service_log = None
-    provider_directory = None
-    user_info = None
+    gt_cols = {"service_date_utc": _week_start()}
     service_log_cols = ["provider_id", "service_id"]
     user_cols = ["name", "id"]
     provider_directory_cols = ["service_id", "price_cents", "price_dollars"]
     try:
-        service_log = load_records_from_file(SERVICE_LOG_INFO, gt_cols=gt_cols)
+        service_log = load_records_from_file(
+            SERVICE_LOG_INFO, gt_cols=gt_cols, columns=service_log_cols
+        )
         if service_log.empty:
             print("No records found within the last 7 days.")
             return
         service_log = service_log[service_log_cols]
-        user_info = load_records_from_file(USER_INFO)[user_cols]
-        provider_directory = load_records_from_file(PROVIDER_DIRECTORY_INFO)[
-            provider_directory_cols
-        ]
+        user_info = load_records_from_file(
+            USER_INFO,
+            columns=user_cols,
+            isin_cols={"id": service_log["provider_id"].unique()},
+        )[user_cols]
+        provider_directory = load_records_from_file(
+            PROVIDER_DIRECTORY_INFO,
+            columns=provider_directory_cols,
+            isin_cols={"service_id": service_log["service_id"].unique()},
+        )[provider_directory_cols]
     except pa.ArrowIOError as err_io:
         PColor.pwarn(f"There was an issue accessing the database.\n\tError: {err_io}")
         return
 
-    records = pd.merge(service_log, provider_directory, on="service_id")
-    records = pd.merge(records, user_info, left_on="provider_id", right_on="id")
-    records["Fee to be paid"] = records["price_dollars"] + records["price_cents"] / 100
-
-    for provider_id in records["provider_id"].unique():
-        provider_record = records[records["provider_id"] == provider_id]
-        current_provider = records["provider_id"] == provider_id
-        # calculate_total_fee is broken out into a function to make it easier to mock for testing
-        total_fee = calculate_total_fee(provider_record["Fee to be paid"])
-        if total_fee < 99999.99:
-            records.loc[current_provider, "Total fee for the week"] = total_fee
-        else:
-            records.loc[current_provider, "Total fee for the week"] = 99999.99
-
-        # calculate_length_of_consultations and calculate_total_fee are broken out into a functions
-        # to make it easier to mock for testing
-        total_consultations = calculate_num_of_consultations(provider_record)
-        if total_consultations < 999:
-            records.loc[
-                current_provider, "Total number of consultations with members"
-            ] = total_consultations
-        else:
-            records.loc[
-                current_provider, "Total number of consultations with members"
-            ] = 999
-
-    records = records.drop_duplicates(subset=["provider_id"])
-    records = records.drop(
-        columns=[
-            "provider_id",
-            "service_id",
-            "price_cents",
-            "price_dollars",
-            "id",
-            "Fee to be paid",
-        ]
-    ).reset_index(drop=True)
-
-    records = records.rename(
-        columns={
-            "name": "Provider Name",
-        }
+    records = (
+        service_log.join(
+            provider_directory.set_index("service_id"), on="service_id", how="inner"
+        )
+        .join(user_info.set_index("id"), on="provider_id", how="inner")
+        .reset_index(drop=True)
     )
+    # Release the loaded tables once joined, so they aren't held while the report is built
+    del service_log, provider_directory, user_info
+    records["fee_cents"] = records["price_dollars"] * 100 + records["price_cents"]
+
+    # Aggregate every provider in one pass, keeping providers in the order they first appear.
+    # calculate_total_fee and calculate_num_of_consultations are broken out into functions to
+    # make it easier to mock for testing
+    providers = records.groupby("provider_id", sort=False)
+    total_fees = providers["fee_cents"].apply(calculate_total_fee)
+    total_consultations = providers["service_id"].apply(calculate_num_of_consultations)
+    records = pd.DataFrame(
+        {
+            "Provider Name": providers["name"].first(),
+            "Total fee for the week": _cap_total_fees(total_fees),
+            "Total number of consultations with members": total_consultations.clip(
+                upper=999
+            ).astype(float),
+        }
+    ).reset_index(drop=True)
 
     total_num_providers = records["Provider Name"].nunique()
     total_num_consultations = records[
@@ -318,14 +340,66 @@ def generate_summary_report() -> None:
     print(f"Summary Report saved to {file_path}")
 
 
+def _save_reports(reports: List[Tuple[pd.DataFrame, str]]) -> List[str]:
+    """
+    Save several reports, overlapping their file writes.
+
+    Reports with the same file name, like those of two members with the same name, are saved
+    one after another by the same worker. The last of them is kept, as when saving in order.
+
+    Args-
+        reports (List[Tuple[pd.DataFrame, str]]): Each report, and the file name to save it to.
+
+    Returns-
+        List[str]: Path each report was saved to, in the same order as reports.
+
+    Raises-
+        IOError: Error while writing a report to its file.
+    """
+    # Position of each report in reports, grouped by file name
+    reports_by_name: Dict[str, List[int]] = {}
+    for position, (_, file_name) in enumerate(reports):
+        reports_by_name.setdefault(file_name, []).append(position)
+
+    paths: Dict[int, str] = {}
+
+    def save_in_order(positions: List[int]) -> None:
+        for position in positions:
+            paths[position] = save_report(*reports[position])
+
+    with ThreadPoolExecutor(max_workers=_REPORT_WRITERS) as executor:
+        # Consume the results, so errors from any worker are raised here
+        list(executor.map(save_in_order, reports_by_name.values()))
+    return [paths[position] for position, _ in enumerate(reports)]
+
+
+def _week_start() -> date:
+    """Returns the date services must be after to be included in this week's reports."""
+    return (datetime.now() - timedelta(days=7)).date()
+
+
 def _current_date() -> str:
     """Returns the current date in the format MM-DD-YYYY."""
     return datetime.now().strftime("%m-%d-%Y")
 
 
-def calculate_total_fee(providers_fees_df: pd.DataFrame) -> float:
-    """Calculates the total fee for a provider."""
-    return providers_fees_df.sum()
+def _cap_total_fees(total_fees: pd.Series) -> pd.Series:
+    """
+    Limit each provider's total fee for the week to the largest fee that can be reported.
+
+    Args-
+        total_fees (pd.Series): Total fee of each provider, in dollars.
+
+    Returns-
+        pd.Series: The total fees in dollars, with any over $99,999.99 set to $99,999.99.
+    """
+    total_fee_cents = (total_fees * 100).round().astype("int64")
+    return total_fee_cents.clip(upper=_MAX_TOTAL_FEE_CENTS) / 100
+
+
+def calculate_total_fee(providers_fees_df: pd.Series) -> float:
+    """Calculates the total fee in dollars for a provider, from their fees in cents."""
+    return providers_fees_df.sum() / 100
 
 
 def calculate_num_of_consultations(providers_consultations_df: pd.DataFrame) -> int:
@@ -12,13 +12,33 @@ Examples-
     def get_full_member_list():
         members = load_records_from_file(MEMBER_INFO)
 """
-from typing import Any, List
+from datetime import date
+from typing import Any, Callable, List, Optional, Tuple
+import numpy as np
 import pyarrow as pa
+import pyarrow.compute as pc
 import pandas as pd
 from dataclasses import dataclass, field
 
+# Smallest number with each digit count from 2 to 20, for counting the digits of integers.
+_POWERS_OF_TEN = np.array(
+    [10**exponent for exponent in range(1, 20)], dtype=np.uint64
+)
+# Quick checks of values that are known to convert to a field type. A value that fails one is
+# checked by converting it with Arrow, which also accepts other compatible values.
+_TYPE_PREDICATES: dict[pa.DataType, Callable[[Any], bool]] = {
+    pa.int64(): lambda value: (
+        (type(value) is int and -(2**63) <= value < 2**63)
+        or isinstance(value, np.signedinteger)
+    ),
+    pa.string(): lambda value: type(value) is str,
+    pa.bool_(): lambda value: type(value) is bool or isinstance(value, np.bool_),
+    pa.binary(): lambda value: type(value) is bytes,
+    pa.date32(): lambda value: type(value) is date,
+}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class TableInfo:
     """Info for one database file."""
 
@@ -28,24 +48,67 @@ class TableInfo:
     character_limits: dict[str, range] = field(default_factory=lambda: {})
     # Limits on numeric length (e.g. only numbers between 0 and 99)
     numeric_limits: dict[str, range] = field(default_factory=lambda: {})
+    # Storage format of the table's file ("parquet" or "feather")
+    file_format: str = "parquet"
+    # Keep the table's records in memory between loads, while its file is unchanged
+    cache_records: bool = False
+    # Lookups built from the schema and limits by __post_init__
+    _names_tuple: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _names_set: frozenset[str] = field(init=False, repr=False, compare=False)
+    _fields_by_name: dict[str, pa.Field] = field(init=False, repr=False, compare=False)
+    _field_checks: dict[str, Callable[[Any], None]] = field(
+        init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         """
         Validates the character and numeric limits against the schema fields.
 
         Ensures that the specified limits correspond to existing fields in the schema.
-        Raises KeyError if a limit is set for a non-existent field.
+        Raises KeyError if a limit is set for a non-existent field, and ValueError if the
+        file format is not supported.
         """
-        for col_name in self.character_limits.keys():
-            if col_name not in self.schema.names:
+        if self.file_format not in ("parquet", "feather"):
+            raise ValueError(
+                f"File format {self.file_format} of {self.name} is not supported."
+            )
+        # Field lookups by name, built once since the schema can't change
+        object.__setattr__(self, "_names_tuple", tuple(self.schema.names))
+        object.__setattr__(self, "_names_set", frozenset(self._names_tuple))
+        object.__setattr__(
+            self,
+            "_fields_by_name",
+            {schema_field.name: schema_field for schema_field in self.schema},
+        )
+        for col_name in self.character_limits:
+            if col_name not in self._names_set:
                 raise KeyError(
                     f"Character limit column {col_name} could not be found in schema {self.name}"
                 )
-        for col_name in self.numeric_limits.keys():
-            if col_name not in self.schema.names:
+        for col_name in self.numeric_limits:
+            if col_name not in self._names_set:
                 raise KeyError(
                     f"Numeric limit column {col_name} could not be found in schema {self.name}"
                 )
+        object.__setattr__(
+            self,
+            "_field_checks",
+            {name: self._compile_field_check(name) for name in self.schema.names},
+        )
+
+    def __reduce__(self):
+        """Pickle only the init fields, so the lookups are rebuilt when unpickled."""
+        return (
+            TableInfo,
+            (
+                self.name,
+                self.schema,
+                self.character_limits,
+                self.numeric_limits,
+                self.file_format,
+                self.cache_records,
+            ),
+        )
 
     def index_col(self) -> str:
         """
@@ -66,7 +129,7 @@ class TableInfo:
         Returns-
             True if all columns are present in the schema, False otherwise.
         """
-        return all(col in self.schema.names for col in columns)
+        return all(col in self._names_set for col in columns)
 
     def check_columns(self, columns: List[str]) -> None:
         """
@@ -78,7 +141,10 @@ class TableInfo:
         Raises-
             KeyError: If there's a mismatch between the data columns and schema columns.
         """
-        if set(self.schema.names) != set(columns):
+        # Columns usually come in schema order, which is cheaper to compare than sets.
+        if tuple(columns) == self._names_tuple:
+            return
+        if self._names_set != set(columns):
             raise KeyError("Data and schema have mismatched columns.")
 
     def check_dataframe(self, data: pd.DataFrame) -> None:
@@ -93,7 +159,20 @@ class TableInfo:
             TypeError: If a value's type is incompatible with the schema.
             ArithmeticError: If a value violates character or numeric limits.
         """
-        data.apply(lambda row: self.check_series(row), axis=1)  # type: ignore
+        self.check_columns(list(data.columns))
+        table: Optional[pa.Table] = None
+        try:
+            table = pa.Table.from_pandas(data, schema=self.schema, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, ValueError):
+            # Check each column on its own, to raise the error for the first failing value
+            for field_name, column in data.items():
+                self._check_column_type(str(field_name), column)
+        for field_name, column in data.items():
+            self._check_column_limits(
+                str(field_name),
+                column,
+                None if table is None else table.column(str(field_name)),
+            )
 
     def check_series(self, data: pd.Series) -> None:
         """
@@ -126,20 +205,127 @@ class TableInfo:
             ArithmeticError: Value doesn't adhere to field's character or numeric limit.
         """
         self._check_field_exists(field_name)
-        self._check_type(field_name, value)
-        self._check_character_limit(field_name, value)
-        self._check_numeric_limit(field_name, value)
+        self._field_checks[field_name](value)
+
+    def _compile_field_check(self, field_name: str) -> Callable[[Any], None]:
+        """
+        Build a function that checks one value for a field, running only the field's checks.
+
+        Args-
+            field_name (str): Name of the schema field the function checks values against.
+
+        Returns-
+            Callable[[Any], None]: Function that raises the same errors as check_field.
+        """
+        is_type = _TYPE_PREDICATES.get(self._fields_by_name[field_name].type)
+
+        def check_type(field_name: str, value: Any) -> None:
+            if is_type is None or not is_type(value):
+                self._check_type(field_name, value)
+
+        field_checks: List[Callable[[str, Any], None]] = [check_type]
+        # Limits are compared against plain ints, and only a failing value builds the error.
+        if field_name in self.character_limits:
+            char_min, char_max = _range_bounds(self.character_limits[field_name])
+
+            def check_character_limit(field_name: str, value: Any) -> None:
+                val_len = len(str(value))
+                if val_len < char_min or val_len > char_max:
+                    self._check_character_limit(field_name, value)
+
+            field_checks.append(check_character_limit)
+        if field_name in self.numeric_limits:
+            num_min, num_max = _range_bounds(self.numeric_limits[field_name])
+
+            def check_numeric_limit(field_name: str, value: Any) -> None:
+                if value < num_min or value > num_max:
+                    self._check_numeric_limit(field_name, value)
+
+            field_checks.append(check_numeric_limit)
+
+        def check(value: Any) -> None:
+            for field_check in field_checks:
+                field_check(field_name, value)
+
+        return check
+
+    def _check_column_type(self, field_name: str, column: pd.Series):
+        """
+        Check the type of every value in a column against one schema field at once.
+
+        When the check fails, each value is passed to the single field check, so that the same
+        error is raised as when checking one field.
+
+        Raises-
+            TypeError: A value's type is incompatible with the field.
+        """
+        field: pa.Field = self._fields_by_name[field_name]
+        try:
+            _ = pa.array(column, type=field.type, from_pandas=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as err_invalid:
+            for value in column:
+                self._check_type(field_name, value)
+            raise TypeError(
+                f"Column {field_name} has wrong type. ({column.dtype} -> {field.type})\n"
+                f"{err_invalid}"
+            )
+
+    def _check_column_limits(
+        self,
+        field_name: str,
+        column: pd.Series,
+        arrow_column: Optional[pa.ChunkedArray] = None,
+    ):
+        """
+        Check every value in a column against one field's character and numeric limits at once.
+
+        The first value outside a limit is passed to the single field check, so that the same
+        error is raised as when checking one field.
+
+        Args-
+            field_name (str): Name of the schema field to check the column against.
+            column (pd.Series): Values to check.
+            arrow_column (Optional[pa.ChunkedArray]):
+                The same values already converted to the field's type, if available. String
+                lengths are counted from it directly.
+
+        Raises-
+            ArithmeticError: A value doesn't adhere to the field's character or numeric limit.
+        """
+        if field_name in self.character_limits:
+            char_min, char_max = _range_bounds(self.character_limits[field_name])
+            if (
+                arrow_column is not None
+                and arrow_column.type == pa.string()
+                and arrow_column.null_count == 0
+            ):
+                lengths = pc.utf8_length(arrow_column).to_numpy()
+            else:
+                lengths = _str_lengths(column)
+            if (lengths < char_min).any() or (lengths > char_max).any():
+                outside = (lengths < char_min) | (lengths > char_max)
+                self._check_character_limit(
+                    field_name, column.iloc[np.flatnonzero(outside)[0]]
+                )
+        if field_name in self.numeric_limits:
+            num_min, num_max = _range_bounds(self.numeric_limits[field_name])
+            values = column.to_numpy()
+            if (values < num_min).any() or (values > num_max).any():
+                outside = (values < num_min) | (values > num_max)
+                self._check_numeric_limit(
+                    field_name, column.iloc[np.flatnonzero(outside)[0]]
+                )
 
     def _check_field_exists(self, field_name: str):
         """Raise a KeyError if a given field doesn't exist in the schema."""
-        if field_name not in self.schema.names:
+        if field_name not in self._names_set:
             raise KeyError(
                 f"Field Name {field_name} does not exist in {self.name} schema."
             )
 
     def _check_type(self, field_name: str, value: Any):
         """Raise an Arithmetic error if a given field/value pair has an incompatible type."""
-        field: pa.Field = self.schema.field(field_name)
+        field: pa.Field = self._fields_by_name[field_name]
         try:
             _ = pa.array([value], type=field.type)
         except pa.ArrowInvalid as err_invalid:
@@ -151,19 +337,18 @@ class TableInfo:
 
     def _check_character_limit(self, field_name: str, value: Any):
         """Raise an Arithmetic error if a given field/value pair exceeds its character limit."""
-        if field_name not in self.character_limits.keys():
+        if field_name not in self.character_limits:
             return
         val_len = len(str(value))
         limit_range = self.character_limits[field_name]
         if (val_len < limit_range.start) or (val_len > limit_range.stop):
-            print(type(value))
             raise ArithmeticError(
                 f"{field_name} value {value} is outside character limit {limit_range} "
             )
 
     def _check_numeric_limit(self, field_name: str, value: Any):
         """Raise an Arithmetic error if a given field/value pair exceeds its numeric limit."""
-        if field_name not in self.numeric_limits.keys():
+        if field_name not in self.numeric_limits:
             return
         limit_range = self.numeric_limits[field_name]
         if (value < limit_range.start) or (value > limit_range.stop):
@@ -172,6 +357,45 @@ class TableInfo:
             )
 
 
+def _range_bounds(limit_range: range) -> Tuple[int, int]:
+    """Returns the lowest and highest allowed values of a limit, both inclusive."""
+    return limit_range.start, limit_range.stop
+
+
+def _str_lengths(column: pd.Series) -> np.ndarray:
+    """
+    Count the characters in each value of a column, as if each value were converted with str().
+
+    Integer and string columns are counted without converting each value to a new string. Other
+    columns are counted one value at a time.
+
+    Args-
+        column (pd.Series): Values to count the characters of.
+
+    Returns-
+        np.ndarray: Number of characters in each value.
+    """
+    if column.dtype.kind in "iu":
+        values = column.to_numpy()
+        digits = np.searchsorted(
+            _POWERS_OF_TEN, np.abs(values).astype(np.uint64), side="right"
+        )
+        # One more for the first digit, and one more for the sign of negative numbers
+        return digits + 1 + (values < 0)
+    if column.dtype == object:
+        try:
+            strings = pa.array(column, from_pandas=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            strings = None
+        if (
+            strings is not None
+            and strings.type == pa.string()
+            and strings.null_count == 0
+        ):
+            return pc.utf8_length(strings).to_numpy()
+    return np.array([len(str(value)) for value in column], dtype=np.int64)
+
+
 """All services offered by ChocAn, and their codes."""
 PROVIDER_DIRECTORY_INFO = TableInfo(
     name="provider_directory",
@@ -185,6 +409,7 @@ PROVIDER_DIRECTORY_INFO = TableInfo(
     ),
     character_limits={"service_id": range(6, 6), "service_name": range(1, 20)},
     numeric_limits={"price_cents": range(1, 99)},
+    cache_records=True,
 )
 
 """All current ChocAn members."""
@@ -209,6 +434,8 @@ MEMBER_INFO = TableInfo(
         "state": range(2, 2),
         "zipcode": range(5, 5),
     },
+    file_format="feather",
+    cache_records=True,
 )
 
 """All current ChocAn providers & managers."""
@@ -235,6 +462,8 @@ USER_INFO = TableInfo(
         "zipcode": range(5, 5),
     },
     numeric_limits={"type": range(0, 1)},
+    file_format="feather",
+    cache_records=True,
 )
 
 """Record of all services logged"""
@@ -242,7 +471,9 @@ SERVICE_LOG_INFO = TableInfo(
     name="service_log",
     schema=pa.schema(
         [
-            pa.field("entry_datetime_utc", pa.date64(), nullable=False),
+            pa.field(
+                "entry_datetime_utc", pa.timestamp("us", tz="UTC"), nullable=False
+            ),
             pa.field("service_date_utc", pa.date32(), nullable=False),
             pa.field("provider_id", pa.int64(), nullable=False),
             pa.field("member_id", pa.int64(), nullable=False),
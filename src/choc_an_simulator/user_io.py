@@ -9,9 +9,17 @@ and colorful text output.
 See 'examples/prompting.py' for usage examples.
 """
 
-from typing import Optional, List, Tuple
+import re
+from typing import Optional, Sequence, Tuple
 from enum import Enum
-from datetime import date, datetime
+from datetime import date
+
+# Text accepted by int(): optional whitespace and sign, and digits with single underscores.
+_INT_RE = re.compile(r"\s*[+-]?\d+(?:_\d+)*\s*")
+# Text accepted by strptime's %m-%d-%Y format, before checking the day exists in the month.
+_DATE_RE = re.compile(
+    r"(1[0-2]|0[1-9]|[1-9])-(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])-(\d{4})"
+)
 
 
 class PColor:
@@ -41,6 +49,9 @@ class PColor:
 
     # ANSI color code to end a color
     _ENDC = "\033[0m"
+    # Format string for each color, wrapping the text in the color's code and _ENDC.
+    # (Class names other than AnsiColor aren't visible inside the comprehension.)
+    _TEMPLATES = {color: f"{color.value}{{}}\033[0m" for color in AnsiColor}
 
     @classmethod
     def pfail(cls, text: str, **kwargs) -> None:
@@ -85,12 +96,12 @@ class PColor:
             color_code: The AnsiColor code defining the color or style of the text.
             **kwargs: Additional keyword arguments passed to the built-in print function.
         """
-        print(f"{color_code.value}{text}{cls._ENDC}", **kwargs)
+        print(cls._TEMPLATES[color_code].format(text), **kwargs)
 
 
 def _parse_date(date_str: str) -> date:
     """
-    Parse a date string into a date object, using %m-%d-%Y format.
+    Parse a date string into a date object, using MM-DD-YYYY format.
 
     Args-
         date_str (str): String to parse into a date.
@@ -101,15 +112,22 @@ def _parse_date(date_str: str) -> date:
     Raises-
         ValueError: Date is in the incorrect format.
     """
+    # The pattern checks the format, so the date is built from its groups without strptime.
+    match = _DATE_RE.fullmatch(date_str)
+    if match is None:
+        raise ValueError("Incorrect date format")
+    month, day, year = match.groups()
     try:
-        result = datetime.strptime(date_str, "%m-%d-%Y").date()
-    # Date incorrectly formatted
+        result = date(int(year), int(month), int(day))
+    # Day is out of range for the month, or year is 0000
     except ValueError:
         raise ValueError("Incorrect date format")
     return result
 
 
-def _prompt_single_date(message: str, min_date: date, max_date: date) -> Optional[date]:
+def _prompt_single_date(
+    message: str, min_date: date, max_date: date, range_error: str
+) -> Optional[date]:
     """
     Prompt the user for a single date.
 
@@ -117,6 +135,7 @@ def _prompt_single_date(message: str, min_date: date, max_date: date) -> Optiona
         message (str): The prompt message displayed to the user.
         min_date (date): Minimum allowed date
         max_date (date): Maximum allowed date
+        range_error (str): Message displayed when the date is outside of min / max date.
 
     Returns-
         int: Valid input, parsed as an integer.
@@ -134,9 +153,7 @@ def _prompt_single_date(message: str, min_date: date, max_date: date) -> Optiona
         PColor.pfail(f"{date_str} is not in MM-DD-YYYY format.")
         raise ValueError
     if not (min_date <= result <= max_date):
-        min_date_str = min_date.strftime("%m-%d-%Y")
-        max_date_str = max_date.strftime("%m-%d-%Y")
-        PColor.pfail(f"Date must be between {min_date_str} and {max_date_str}")
+        PColor.pfail(range_error)
         raise ValueError
     return result
 
@@ -158,7 +175,6 @@ def prompt_date(
     Raises-
         ValueError: If min_date is greater than max_date.
     """
-    result: Optional[date] = None
     # Default min / max date to their absolute min / max values.
     min_date = min_date or date.min
     max_date = max_date or date.max
@@ -166,24 +182,29 @@ def prompt_date(
     if min_date > max_date:
         raise ValueError(f"min_date {min_date} must be less than max_date {max_date}")
     message = f"{message} (MM-DD-YYYY)"
+    # Limits don't change between attempts, so format the out of range message once.
+    min_date_str = min_date.strftime("%m-%d-%Y")
+    max_date_str = max_date.strftime("%m-%d-%Y")
+    range_error = f"Date must be between {min_date_str} and {max_date_str}"
     # Repeatedly prompt for a date until valid input or user exits.
     while True:
         try:
-            result = _prompt_single_date(message, min_date, max_date)
+            result = _prompt_single_date(message, min_date, max_date, range_error)
         except ValueError:
             continue
-        if result is None:
-            return None
+        # result is None if the user aborted
         return result
 
 
-def prompt_menu_options(message: str, choices: List[str]) -> Optional[Tuple[int, str]]:
+def prompt_menu_options(
+    message: str, choices: Sequence[str]
+) -> Optional[Tuple[int, str]]:
     """
     Prompts the user to select an option from a list of choices.
 
     Args-
         message: The prompt message displayed to the user.
-        choices: A list of string options to choose from.
+        choices: A list or tuple of string options to choose from.
 
     Returns-
         A tuple containing the index and text of the chosen option, or None if aborted.
@@ -193,9 +214,14 @@ def prompt_menu_options(message: str, choices: List[str]) -> Optional[Tuple[int,
     """
     if len(choices) == 0:
         raise ValueError("'choices' may not be empty.")
-    print(message)
-    for i, choice in enumerate(choices):
-        PColor.pok(f"{i+1}: ", end=f"{choice}\n")
+    # Render the whole menu, with each choice's number in green, and print it in one call.
+    number_template = PColor._TEMPLATES[PColor.AnsiColor.OKGREEN]
+    menu = "".join(
+        number_template.format(f"{number}: ") + f"{choice}\n"
+        for number, choice in enumerate(choices, 1)
+    )
+    print(f"{message}\n{menu}", end="")
+    # Limits are inclusive, so this allows selections 1 through len(choices).
     selection = prompt_int(
         message="Selection",
         char_limit=None,
@@ -228,19 +254,22 @@ def _prompt_single_int(
     if result_text is None:  # user pressed ctrl+c
         return None
 
+    # Fixed width inputs, like IDs, must be all digits. Reject anything else without parsing it.
+    fixed_width = (char_limit is not None) and (char_limit.start == char_limit.stop)
+    if fixed_width and not result_text.isdecimal():
+        print(f'"{result_text}" is not a valid integer.')
+        raise ValueError
     result = _to_int_(result_text)
     # Result could not be converted
     if result is None:
         print(f'"{result_text}" is not a valid integer.')
         raise ValueError
-    # Result could not be converted
-    if (numeric_limit is not None) and not (
-        numeric_limit.start <= result <= numeric_limit.stop
-    ):
-        PColor.pfail(
-            f"{result} is not in the range ({numeric_limit.start}-{numeric_limit.stop})"
-        )
-        raise ValueError
+    # Result is outside the numeric limit
+    if numeric_limit is not None:
+        num_min, num_max = numeric_limit.start, numeric_limit.stop
+        if not (num_min <= result <= num_max):
+            PColor.pfail(f"{result} is not in the range ({num_min}-{num_max})")
+            raise ValueError
     return result
 
 
@@ -260,7 +289,6 @@ def prompt_int(
     Returns-
         The integer entered by the user, or None if the input is aborted.
     """
-    result: Optional[int] = None
     # If there is a numeric limit, add it to the message string.
     if numeric_limit is not None:
         message = f"{message} ({numeric_limit.start}-{numeric_limit.stop})"
@@ -270,18 +298,20 @@ def prompt_int(
             result = _prompt_single_int(message, char_limit, numeric_limit)
         except ValueError:
             continue
-        if result is None:
-            return None
+        # result is None if the user aborted
         return result
 
 
-def _prompt_single_str(message: str, char_limit: Optional[range]) -> Optional[str]:
+def _prompt_single_str(
+    message: str, char_limit: Optional[range], pattern: Optional[re.Pattern] = None
+) -> Optional[str]:
     """
     Prompt the user for a single string.
 
     Args-
         message (str): The prompt message displayed to the user.
         char_limit (str): The max / min character length of the input (optional).
+        pattern (re.Pattern): Precompiled pattern the whole input must match (optional).
 
     Returns-
         int: The inputted string.
@@ -295,31 +325,38 @@ def _prompt_single_str(message: str, char_limit: Optional[range]) -> Optional[st
     except KeyboardInterrupt:
         print()
         return None
-    if (char_limit is not None) and not (
-        char_limit.start <= len(result) <= char_limit.stop
-    ):
-        PColor.pfail(
-            "Input must be between "
-            f"{char_limit.start} and {char_limit.stop} characters long."
-        )
+    if char_limit is not None:
+        char_min, char_max = char_limit.start, char_limit.stop
+        if not (char_min <= len(result) <= char_max):
+            PColor.pfail(
+                f"Input must be between {char_min} and {char_max} characters long."
+            )
+            raise ValueError
+    if (pattern is not None) and (pattern.fullmatch(result) is None):
+        PColor.pfail(f'"{result}" is not in the expected format.')
         raise ValueError
     return result
 
 
-def prompt_str(message: str, char_limit: Optional[range] = None) -> Optional[str]:
+def prompt_str(
+    message: str,
+    char_limit: Optional[range] = None,
+    pattern: Optional[re.Pattern] = None,
+) -> Optional[str]:
     """
-    Prompts the user for a string input with an optional character limit.
+    Prompts the user for a string input with an optional character limit and format.
 
     Args-
         message: The prompt message displayed to the user.
         char_limit: The range of acceptable character lengths for the input.
+        pattern: Precompiled regular expression the whole input must match.
 
     Returns-
         The string entered by the user, or None if the input is aborted.
     """
     while True:
         try:
-            result = _prompt_single_str(message, char_limit)
+            result = _prompt_single_str(message, char_limit, pattern)
         except ValueError:
             continue
         return result
@@ -335,6 +372,9 @@ def _to_int_(text: str) -> Optional[int]:
     Returns-
         The converted integer, or None if the conversion is not possible.
     """
+    # Reject text that isn't an integer without raising and catching an exception.
+    if _INT_RE.fullmatch(text) is None:
+        return None
     try:
         return int(text)
     except ValueError:
@@ -1,9 +1,11 @@
 """Tests of the database_management module."""
+from dataclasses import replace
 from datetime import datetime, date, timezone
 import os
 import pytest
 import pandas as pd
 import pyarrow as pa
+import pyarrow.parquet as pq
 from choc_an_simulator.schemas import TableInfo
 from choc_an_simulator.database_management import (
     add_records_to_file,
@@ -11,10 +13,12 @@ from choc_an_simulator.database_management import (
     update_record,
     remove_record,
     save_report,
+    RecordBuffer,
 )
 from choc_an_simulator.database_management._write_records import (
     _overwrite_records_to_file_,
 )
+from choc_an_simulator.database_management import load_records
 from choc_an_simulator.database_management.load_records import (
     _load_all_records_from_file_,
 )
@@ -70,6 +74,17 @@ def test_table_info() -> TableInfo:
     )
 
 
+@pytest.fixture()
+def test_feather_table_info() -> TableInfo:
+    """Fixture of a TableInfo object stored in the Feather format."""
+    return TableInfo(
+        name="test_feather",
+        schema=pa.schema([("ID", pa.int64()), ("value", pa.float64())]),
+        numeric_limits={"value": range(0, 3)},
+        file_format="feather",
+    )
+
+
 @pytest.fixture
 def test_table_info_wrong_columns():
     """Fixture TableInfo object with the same name as test_table_info, but different columns."""
@@ -89,6 +104,68 @@ def test_file(test_records, test_table_info):
         os.remove(test_path)
 
 
+@pytest.fixture()
+def test_feather_file(test_records, test_feather_table_info):
+    """Fixture to setup and teardown an test Feather file"""
+    _overwrite_records_to_file_(test_records, test_feather_table_info)
+    yield None
+    test_path = os.path.join(_PARQUET_DIR_, f"{test_feather_table_info.name}.arrow")
+    if os.path.exists(test_path):
+        os.remove(test_path)
+
+
+@pytest.fixture()
+def test_feather_table_parquet_file(test_records, test_feather_table_info):
+    """Fixture of a Feather table's records, saved before it was stored in the Feather format."""
+    _overwrite_records_to_file_(
+        test_records, replace(test_feather_table_info, file_format="parquet")
+    )
+    yield None
+    for file_format in ("parquet", "feather"):
+        test_path = _convert_parquet_name_to_path_(
+            test_feather_table_info.name, file_format
+        )
+        if os.path.exists(test_path):
+            os.remove(test_path)
+
+
+@pytest.fixture()
+def test_timestamp_table_info() -> TableInfo:
+    """Fixture of a TableInfo object with a timestamp column, like the service log's entry time."""
+    return TableInfo(
+        name="test_timestamp",
+        schema=pa.schema(
+            [
+                pa.field("entry_datetime_utc", pa.timestamp("us", tz="UTC")),
+                pa.field("service_date_utc", pa.date32()),
+            ]
+        ),
+    )
+
+
+@pytest.fixture()
+def test_date64_file(test_timestamp_table_info):
+    """Fixture of a file written when the timestamp column's type was date64."""
+    path = _convert_parquet_name_to_path_(test_timestamp_table_info.name)
+    pd.DataFrame(
+        {
+            "entry_datetime_utc": [date(2023, 1, 2), date(2023, 1, 9)],
+            "service_date_utc": [date(2023, 1, 1), date(2023, 1, 8)],
+        }
+    ).to_parquet(
+        path,
+        schema=pa.schema(
+            [
+                pa.field("entry_datetime_utc", pa.date64()),
+                pa.field("service_date_utc", pa.date32()),
+            ]
+        ),
+    )
+    yield None
+    if os.path.exists(path):
+        os.remove(path)
+
+
 @pytest.fixture()
 def corrupted_test_file(test_file, test_table_info):
     """Fixture to setup and teardown an test file."""
@@ -214,13 +291,47 @@ class TestLoadRecordsFromFile:
         """Test loading with valid filters"""
         # Test 1: Equality filter
         eq_records = load_records_from_file(test_table_info, eq_cols={"ID": 1})
-        assert test_records[test_records["ID"] == 1].equals(eq_records)
+        assert (
+            test_records[test_records["ID"] == 1]
+            .reset_index(drop=True)
+            .equals(eq_records)
+        )
         # Test 2: Less-than filter
         lt_records = load_records_from_file(test_table_info, lt_cols={"value": 2.0})
-        assert test_records[test_records["value"] < 2.0].equals(lt_records)
+        assert (
+            test_records[test_records["value"] < 2.0]
+            .reset_index(drop=True)
+            .equals(lt_records)
+        )
         # Test 3: Greater-than filter
         lt_records = load_records_from_file(test_table_info, gt_cols={"value": 2.0})
-        assert test_records[test_records["value"] > 2.0].equals(lt_records)
+        assert (
+            test_records[test_records["value"] > 2.0]
+            .reset_index(drop=True)
+            .equals(lt_records)
+        )
+        # Test 4: Combined filters
+        combined_records = load_records_from_file(
+            test_table_info, eq_cols={"ID": 2}, gt_cols={"value": 2.0}
+        )
+        assert (
+            test_records[(test_records["ID"] == 2) & (test_records["value"] > 2.0)]
+            .reset_index(drop=True)
+            .equals(combined_records)
+        )
+
+    def test_load_records_from_file_isin(
+        self, test_table_info, test_records, test_file
+    ):
+        """Test loading records whose values are in a set of values."""
+        isin_records = load_records_from_file(
+            test_table_info, isin_cols={"ID": [1, 3, 99]}
+        )
+        assert (
+            test_records[test_records["ID"].isin([1, 3])]
+            .reset_index(drop=True)
+            .equals(isin_records)
+        )
 
     def test_load_records_from_file_invalid_equality(self, test_table_info, test_file):
         """Test loading records with an unsupported equality filter."""
@@ -244,6 +355,12 @@ class TestLoadRecordsFromFile:
             ({"lt_cols": {"value": "a"}}, TypeError),
             # Greater-than filter with invalid type
             ({"gt_cols": {"value": "a"}}, TypeError),
+            # Set filter with invalid type
+            ({"isin_cols": {"value": ["a"]}}, TypeError),
+            # Equality filter with a value that has no Arrow type
+            ({"eq_cols": {"ID": {1: 2}}}, TypeError),
+            # Equality filter with a value too large for any Arrow type
+            ({"eq_cols": {"ID": 2**70}}, TypeError),
             # Equality filter with invalid column name
             ({"eq_cols": {"invalid": 1}}, KeyError),
             # Less-than filter with invalid column name
@@ -259,6 +376,206 @@ class TestLoadRecordsFromFile:
         with pytest.raises(error_type):
             load_records_from_file(test_table_info, **kwargs)
 
+    @pytest.mark.parametrize(
+        "info,file",
+        [
+            ("test_table_info", "test_file"),
+            ("test_feather_table_info", "test_feather_file"),
+        ],
+    )
+    def test_load_records_from_file_columns(self, info, file, test_records, request):
+        """Test loading a subset of columns, with and without filters."""
+        table_info = request.getfixturevalue(info)
+        request.getfixturevalue(file)
+        # Test 1: Columns only
+        id_records = load_records_from_file(table_info, columns=["ID"])
+        assert test_records[["ID"]].equals(id_records)
+        # Test 2: Columns with a filter on a column that isn't returned.
+        filtered_records = load_records_from_file(
+            table_info, lt_cols={"value": 2.0}, columns=["ID"]
+        )
+        assert test_records[test_records["value"] < 2.0][["ID"]].equals(
+            filtered_records
+        )
+
+    def test_load_records_from_file_columns_schema_cached(
+        self, test_table_info, test_records, test_records_additional, test_file, mocker
+    ):
+        """Test that a file's schema is only read again after the file changes."""
+        read_schema = mocker.spy(pq, "read_schema")
+        load_records_from_file(test_table_info, columns=["ID"])
+        load_records_from_file(test_table_info, columns=["ID"])
+        assert read_schema.call_count == 1
+        add_records_to_file(test_records_additional, test_table_info)
+        load_records_from_file(test_table_info, columns=["ID"])
+        assert read_schema.call_count == 2
+
+    def test_load_records_from_file_columns_invalid(self, test_table_info, test_file):
+        """Test loading a column that isn't in the schema."""
+        with pytest.raises(KeyError):
+            load_records_from_file(test_table_info, columns=["invalid"])
+
+    def test_load_records_from_file_columns_mismatched_schema(
+        self, test_table_info_wrong_columns, test_file
+    ):
+        """Test loading a subset of columns from a file with a different schema."""
+        with pytest.raises(KeyError):
+            load_records_from_file(test_table_info_wrong_columns, columns=["records"])
+
+    def test_load_records_from_file_columns_missing_file(self, test_table_info):
+        """Test loading a subset of columns from a file that doesn't exist."""
+        empty_records = load_records_from_file(test_table_info, columns=["ID"])
+        assert empty_records.empty
+        assert list(empty_records.columns) == ["ID"]
+
+    def test_load_records_from_feather_file(
+        self, test_feather_table_info, test_records, test_feather_file
+    ):
+        """Test loading all records from a Feather file."""
+        all_records = load_records_from_file(test_feather_table_info)
+        assert test_records.equals(all_records)
+
+    @pytest.mark.parametrize("cache_records", [False, True])
+    def test_load_records_from_feather_table_parquet_file(
+        self,
+        cache_records,
+        test_feather_table_info,
+        test_records,
+        test_feather_table_parquet_file,
+    ):
+        """Test loading a Feather table's records from its older Parquet file."""
+        table_info = replace(test_feather_table_info, cache_records=cache_records)
+        assert load_records_from_file(table_info).equals(test_records)
+        filtered = load_records_from_file(table_info, eq_cols={"ID": 2})
+        assert filtered.equals(test_records.iloc[1:].reset_index(drop=True))
+
+    def test_add_records_to_feather_table_parquet_file(
+        self,
+        test_feather_table_info,
+        test_records,
+        test_records_additional,
+        test_feather_table_parquet_file,
+    ):
+        """Test that adding to a Feather table saves its older Parquet records as Feather."""
+        add_records_to_file(test_records_additional, test_feather_table_info)
+        feather_path = _convert_parquet_name_to_path_(
+            test_feather_table_info.name, "feather"
+        )
+        assert os.path.exists(feather_path)
+        expected = pd.concat([test_records, test_records_additional], ignore_index=True)
+        assert load_records_from_file(test_feather_table_info).equals(expected)
+
+    @pytest.mark.parametrize("cache_records", [False, True])
+    def test_load_records_from_date64_file(
+        self, cache_records, test_timestamp_table_info, test_date64_file
+    ):
+        """Test loading records saved when the timestamp column's type was date64."""
+        table_info = replace(test_timestamp_table_info, cache_records=cache_records)
+        entry_times = pd.Series(
+            [
+                datetime(2023, 1, 2, tzinfo=timezone.utc),
+                datetime(2023, 1, 9, tzinfo=timezone.utc),
+            ]
+        ).astype("datetime64[us, UTC]")
+        records = load_records_from_file(table_info)
+        assert records["entry_datetime_utc"].equals(
+            entry_times.rename("entry_datetime_utc")
+        )
+        filtered = load_records_from_file(
+            table_info,
+            gt_cols={"service_date_utc": date(2023, 1, 2)},
+            lt_cols={"entry_datetime_utc": datetime(2023, 2, 1, tzinfo=timezone.utc)},
+            columns=["entry_datetime_utc"],
+        )
+        assert filtered["entry_datetime_utc"].tolist() == entry_times.iloc[1:].tolist()
+
+    def test_add_records_to_date64_file(
+        self, test_timestamp_table_info, test_date64_file
+    ):
+        """Test that adding to a file with date64 entry times saves it with timestamps."""
+        new_entry = datetime(2023, 1, 10, 12, 30, tzinfo=timezone.utc)
+        buffer = RecordBuffer(test_timestamp_table_info)
+        buffer.append(
+            {"entry_datetime_utc": new_entry, "service_date_utc": date(2023, 1, 10)}
+        )
+        buffer.flush()
+        path = _convert_parquet_name_to_path_(test_timestamp_table_info.name)
+        assert pq.read_schema(path).types == test_timestamp_table_info.schema.types
+        records = load_records_from_file(test_timestamp_table_info)
+        assert records["entry_datetime_utc"].iloc[-1] == new_entry
+
+    def test_load_records_from_file_unconvertible_types(
+        self, test_table_info, test_file
+    ):
+        """Test loading a file whose column types can't be converted to the schema."""
+        interval_table_info = TableInfo(
+            name=test_table_info.name,
+            schema=pa.schema(
+                [("ID", pa.int64()), ("value", pa.month_day_nano_interval())]
+            ),
+        )
+        with pytest.raises(TypeError):
+            load_records_from_file(interval_table_info)
+
+    def test_overwrite_memory_mapped_feather_file(
+        self, test_feather_table_info, test_records, test_feather_file
+    ):
+        """Test that rewriting a Feather file leaves a mapped table from the old file intact."""
+        path = _convert_parquet_name_to_path_(test_feather_table_info.name, "feather")
+        with pa.memory_map(path, "r") as mapped_file:
+            old_table = pa.ipc.open_file(mapped_file).read_all()
+            _overwrite_records_to_file_(test_records.iloc[:1], test_feather_table_info)
+            assert old_table.to_pandas().equals(test_records)
+        assert not os.path.exists(path + ".tmp")
+        assert load_records_from_file(test_feather_table_info).equals(
+            test_records.iloc[:1]
+        )
+
+    def test_overwrite_memory_mapped_parquet_file(
+        self, test_table_info, test_records, test_file
+    ):
+        """Test that rewriting a Parquet file leaves a table read from the old file intact."""
+        path = _convert_parquet_name_to_path_(test_table_info.name)
+        old_table = pq.read_table(path, memory_map=True)
+        _overwrite_records_to_file_(test_records.iloc[:1], test_table_info)
+        assert old_table.to_pandas().equals(test_records)
+        assert not os.path.exists(path + ".tmp")
+        assert load_records_from_file(test_table_info).equals(test_records.iloc[:1])
+
+    def test_load_records_from_file_cached(
+        self, mocker, test_table_info, test_records, test_file
+    ):
+        """Test that full loads of a cached table are reused until the file is rewritten."""
+        cached_table_info = replace(test_table_info, cache_records=True)
+        read_table = mocker.spy(load_records, "_read_table_")
+
+        first_load = load_records_from_file(cached_table_info)
+        first_load["value"] = 0.0
+        assert load_records_from_file(cached_table_info).equals(test_records)
+        assert read_table.call_count == 1
+
+        _overwrite_records_to_file_(test_records.iloc[:1], cached_table_info)
+        assert load_records_from_file(cached_table_info).equals(test_records.iloc[:1])
+        assert read_table.call_count == 2
+
+    def test_load_records_from_file_cached_filtered(
+        self, mocker, test_table_info, test_records, test_file
+    ):
+        """Test that filtered loads of a cached table are selected from the cached records."""
+        cached_table_info = replace(test_table_info, cache_records=True)
+        read_table = mocker.spy(load_records, "_read_table_")
+
+        load_records_from_file(cached_table_info)
+        filtered = load_records_from_file(
+            cached_table_info, gt_cols={"ID": 1}, columns=["value"]
+        )
+        uncached = load_records_from_file(
+            test_table_info, gt_cols={"ID": 1}, columns=["value"]
+        )
+        assert filtered.equals(uncached)
+        assert filtered.equals(test_records.iloc[1:][["value"]].reset_index(drop=True))
+        assert read_table.call_count == 2
+
     def test_load_records_from_file_missing_file(self, test_table_info):
         """Test loading from a file that doesn't exist."""
         empty_records = load_records_from_file(test_table_info)
@@ -421,6 +738,125 @@ class TestOverwriteRecordsToFile:
         with pytest.raises(pa.ArrowIOError):
             _overwrite_records_to_file_(self.new_records, test_table_info)
 
+    def test_overwrite_records_to_file_io_error_partial_write(
+        self, test_table_info, test_records, test_file, mocker
+    ):
+        """Test that a partly written file is removed after an I/O error"""
+        path = _convert_parquet_name_to_path_(test_table_info.name)
+
+        def write_partial_file(_table, where, **_kwargs):
+            with open(where, "wb") as partial_file:
+                partial_file.write(b"PAR1")
+            raise pa.ArrowIOError
+
+        mocker.patch("pyarrow.parquet.write_table", side_effect=write_partial_file)
+        with pytest.raises(pa.ArrowIOError):
+            _overwrite_records_to_file_(self.new_records, test_table_info)
+        assert not os.path.exists(path + ".tmp")
+        assert load_records_from_file(test_table_info).equals(test_records)
+
+
+class TestRecordBuffer:
+    """Validate functionality and error handling of the RecordBuffer class."""
+
+    def test_record_buffer_flush(
+        self, test_table_info, test_records, test_records_additional, test_file
+    ):
+        """Test that buffered records are only written when flushed."""
+        buffer = RecordBuffer(test_table_info)
+        buffer.append({"ID": 3, "value": 3.0})
+        assert len(buffer) == 1
+        assert load_records_from_file(test_table_info).equals(test_records)
+        buffer.flush()
+        assert len(buffer) == 0
+        expected_records = pd.concat(
+            [test_records, test_records_additional]
+        ).reset_index(drop=True)
+        assert load_records_from_file(test_table_info).equals(expected_records)
+
+    def test_record_buffer_flush_empty(self, test_table_info, mocker):
+        """Test that flushing an empty buffer doesn't touch the file."""
+        write_table = mocker.patch("pyarrow.parquet.write_table")
+        RecordBuffer(test_table_info).flush()
+        write_table.assert_not_called()
+
+    def test_record_buffer_full(self, test_table_info, test_file):
+        """Test that a full buffer is written without calling flush."""
+        buffer = RecordBuffer(test_table_info, batch_size=2)
+        buffer.append({"ID": 3, "value": 0.5})
+        buffer.append({"ID": 4, "value": 1.5})
+        assert len(buffer) == 0
+        assert list(load_records_from_file(test_table_info)["ID"]) == [1, 2, 3, 4]
+
+    @pytest.mark.parametrize(
+        "record,error_type",
+        [
+            # Missing column
+            ({"ID": 3}, KeyError),
+            # Wrong type
+            ({"ID": 3, "value": "a"}, TypeError),
+            # Out of range
+            ({"ID": 3, "value": 5.0}, ArithmeticError),
+        ],
+    )
+    def test_record_buffer_append_invalid(self, record, error_type, test_table_info):
+        """Test that invalid records are rejected before they are buffered."""
+        buffer = RecordBuffer(test_table_info)
+        with pytest.raises(error_type):
+            buffer.append(record)
+        assert len(buffer) == 0
+
+    def test_record_buffer_append_duplicate(self, test_table_info):
+        """Test that a record with the index value of a buffered record is rejected."""
+        buffer = RecordBuffer(test_table_info)
+        buffer.append({"ID": 3, "value": 1.0})
+        with pytest.raises(ValueError):
+            buffer.append({"ID": 3, "value": 2.0})
+        assert len(buffer) == 1
+
+    def test_record_buffer_clear(self, test_table_info, mocker):
+        """Test that clearing the buffer drops its records without writing them."""
+        add_records = mocker.patch(
+            "choc_an_simulator.database_management.record_buffer.add_records_to_file"
+        )
+        buffer = RecordBuffer(test_table_info)
+        buffer.append({"ID": 3, "value": 1.0})
+        buffer.clear()
+        assert len(buffer) == 0
+        buffer.append({"ID": 3, "value": 1.0})
+        buffer.flush()
+        assert len(add_records.call_args.args[0]) == 1
+
+    @pytest.mark.parametrize(
+        "error_type",
+        [pa.ArrowInvalid, pa.ArrowIOError, ValueError],
+    )
+    def test_record_buffer_full_write_error(self, error_type, test_table_info, mocker):
+        """Test that errors writing a full buffer are raised by append."""
+        mocker.patch(
+            "choc_an_simulator.database_management.record_buffer.add_records_to_file",
+            side_effect=error_type,
+        )
+        buffer = RecordBuffer(test_table_info, batch_size=1)
+        with pytest.raises(error_type):
+            buffer.append({"ID": 3, "value": 1.0})
+
+    @pytest.mark.parametrize(
+        "error_type",
+        [pa.ArrowInvalid, pa.ArrowIOError, ValueError],
+    )
+    def test_record_buffer_flush_error(self, error_type, test_table_info, mocker):
+        """Test that records stay buffered when they can't be written."""
+        mocker.patch(
+            "choc_an_simulator.database_management.record_buffer.add_records_to_file",
+            side_effect=error_type,
+        )
+        buffer = RecordBuffer(test_table_info)
+        buffer.append({"ID": 3, "value": 1.0})
+        with pytest.raises(error_type):
+            buffer.flush()
+        assert len(buffer) == 1
+
 
 class TestSaveReport:
     """Validate functionality and error handling of the save_report function."""
@@ -470,6 +906,75 @@ class TestSaveReport:
         )
         os.remove(path)
 
+    def test_save_report_mixed_columns(self):
+        """Test saving a report with mixed date columns and microsecond datetimes"""
+        report_input = pd.DataFrame(
+            {
+                "mixed": [date(2021, 1, 1), "text"],
+                "dttm": pd.Series(self.report_input["dttm"]).astype(
+                    "datetime64[us, UTC]"
+                ),
+            }
+        )
+        path = save_report(report_input, "test_mixed")
+        reloaded_from_file = pd.read_csv(path)
+        os.remove(path)
+        assert reloaded_from_file["mixed"].tolist() == ["01-01-2021", "text"]
+        assert (
+            reloaded_from_file["dttm"].tolist() == self.expected_output["dttm"].tolist()
+        )
+
+    @pytest.mark.parametrize(
+        "column,expected",
+        [
+            # Mixed types
+            ([1, "text"], ["1", "text"]),
+            # Lists
+            ([[1], [2]], ["[1]", "[2]"]),
+        ],
+    )
+    def test_save_report_pandas_fallback(self, column, expected):
+        """Test saving a report with columns that Arrow can't write"""
+        path = save_report(
+            pd.DataFrame({"column": column}), "test_fallback", arrow_writer=True
+        )
+        reloaded_from_file = pd.read_csv(path, dtype=str)
+        os.remove(path)
+        assert reloaded_from_file["column"].tolist() == expected
+
+    @pytest.mark.parametrize(
+        "arrow_writer,expected",
+        [
+            (
+                False,
+                b"Provider Name,Date of service,Fee,Count\n"
+                b'"Acme, Inc",01-02-2023,3.0,1\n'
+                b"Bo,,2.5,2\n",
+            ),
+            (
+                True,
+                b'"Provider Name","Date of service","Fee","Count"\n'
+                b'"Acme, Inc","01-02-2023",3,1\n'
+                b'"Bo",,2.5,2\n',
+            ),
+        ],
+    )
+    def test_save_report_csv_bytes(self, arrow_writer, expected):
+        """Test the exact CSV written by pandas, and by Arrow's writer when it is chosen."""
+        report_input = pd.DataFrame(
+            {
+                "Provider Name": ["Acme, Inc", "Bo"],
+                "Date of service": [date(2023, 1, 2), None],
+                "Fee": [3.0, 2.5],
+                "Count": [1, 2],
+            }
+        )
+        path = save_report(report_input, "test_bytes", arrow_writer=arrow_writer)
+        with open(path, "rb") as report_file:
+            written = report_file.read()
+        os.remove(path)
+        assert written == expected
+
     def test_save_report_bad_path(self):
         """Test saving a report to a non-existent location"""
         with pytest.raises(IOError):
@@ -481,3 +986,6 @@ def test_convert_name_to_path():
     assert _convert_parquet_name_to_path_("name") == os.path.join(
         _PARQUET_DIR_, "name.pkt"
     )
+    assert _convert_parquet_name_to_path_("name", "feather") == os.path.join(
+        _PARQUET_DIR_, "name.arrow"
+    )
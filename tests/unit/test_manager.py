@@ -169,8 +169,14 @@ class TestAddMemberRecord:
     @pytest.mark.usefixtures("mock_input_series")
     def test_add_member_record_valid(self, mocker, mock_input_series):
         """Test of the add_member_record function with valid input"""
-        mocker.patch("choc_an_simulator.manager.add_records_to_file", return_value=None)
+        mock_add_records = mocker.patch(
+            "choc_an_simulator.manager.add_records_to_file", return_value=None
+        )
         add_member_record()
+        member_record = mock_add_records.call_args.args[0]
+        assert list(member_record.columns) == MEMBER_INFO.schema.names
+        assert member_record["name"].iloc[0] == "Donald"
+        assert member_record["zipcode"].iloc[0] == 97212
 
     @pytest.mark.parametrize(
         "input_strs", [["Donald", "1234 NE Street st.", "Portland", "OR", "97212"]]
@@ -387,8 +393,14 @@ class TestAddProviderRecord:
     @pytest.mark.usefixtures("mock_input_series")
     def test_add_provider_record_valid(self, mocker, mock_input_series):
         """Test of the add_provider_record function with valid input"""
-        mocker.patch("choc_an_simulator.manager.add_records_to_file", return_value=None)
+        mock_add_records = mocker.patch(
+            "choc_an_simulator.manager.add_records_to_file", return_value=None
+        )
         add_provider_record()
+        provider_record = mock_add_records.call_args.args[0]
+        assert list(provider_record.columns) == USER_INFO.schema.names
+        assert provider_record["type"].iloc[0] == 1
+        assert provider_record["city"].iloc[0] == "Portland"
 
     @pytest.mark.parametrize(
         "input_strs", [["Donald", "1234 NE Street st.", "Portland", "OR", "97212"]]
@@ -581,6 +593,59 @@ class TestAddProviderDirectoryRecord:
             in capsys.readouterr().out
         )
 
+    def test_add_provider_directory_record_valid(self, mocker, capsys):
+        """Test of the add_provider_directory_record function with valid input"""
+        mocker.patch(
+            "choc_an_simulator.manager.generate_unique_id", return_value=100001
+        )
+        mocker.patch("choc_an_simulator.manager.prompt_str", return_value="Therapy")
+        mocker.patch("choc_an_simulator.manager.prompt_int", side_effect=[100, 50])
+        mock_add_records = mocker.patch(
+            "choc_an_simulator.manager.add_records_to_file"
+        )
+        add_provider_directory_record()
+        service_record = mock_add_records.call_args.args[0]
+        PROVIDER_DIRECTORY_INFO.check_dataframe(service_record)
+        assert service_record.to_dict("records") == [
+            {
+                "service_id": 100001,
+                "service_name": "Therapy",
+                "price_dollars": 100,
+                "price_cents": 50,
+            }
+        ]
+        assert "Service #100001 Added." in capsys.readouterr().out
+
+    def test_add_provider_directory_record_user_exit(self, mocker):
+        """Test of the add_provider_directory_record function with user exit."""
+        mocker.patch(
+            "choc_an_simulator.manager.generate_unique_id", return_value=100001
+        )
+        mocker.patch("choc_an_simulator.manager.prompt_str", return_value="Therapy")
+        mocker.patch("choc_an_simulator.manager.prompt_int", side_effect=[100, None])
+        mock_add_records = mocker.patch(
+            "choc_an_simulator.manager.add_records_to_file"
+        )
+        add_provider_directory_record()
+        mock_add_records.assert_not_called()
+
+    def test_add_provider_directory_record_io_error(self, mocker, capsys):
+        """Test of the add_provider_directory_record function with an IO error"""
+        mocker.patch(
+            "choc_an_simulator.manager.generate_unique_id", return_value=100001
+        )
+        mocker.patch("choc_an_simulator.manager.prompt_str", return_value="Therapy")
+        mocker.patch("choc_an_simulator.manager.prompt_int", side_effect=[100, 50])
+        mocker.patch(
+            "choc_an_simulator.manager.add_records_to_file",
+            side_effect=pa.ArrowIOError,
+        )
+        add_provider_directory_record()
+        assert (
+            "There was an issue accessing the database. Service was not added."
+            in capsys.readouterr().out
+        )
+
 
 # class TestUpdateProviderDirectoryRecord:
 def test_update_provider_directory_load_io_error(mocker, capsys) -> None:
@@ -683,3 +748,19 @@ class TestRemoveProviderDirectoryRecord:
             f"There as an error and service {service_id} was not removed!"
             in capsys.readouterr().out
         )
+
+
+@pytest.mark.parametrize(
+    "remove_function,expected_limit",
+    [
+        (remove_member_record, range(100000000, 999999999)),
+        (remove_provider_record, range(100000000, 999999999)),
+        (remove_provider_directory_record, range(100000, 999999)),
+    ],
+)
+def test_id_prompt_numeric_limit(remove_function, expected_limit, mocker):
+    """Test that ID prompts only accept IDs with the number of digits set by the schema."""
+    mock_prompt_int = mocker.patch(f"{CAS_MGR_PATH}.prompt_int", return_value=None)
+    mocker.patch(f"{CAS_MGR_PATH}.remove_record", return_value=False)
+    remove_function()
+    assert mock_prompt_int.call_args.kwargs["numeric_limit"] == expected_limit
@@ -4,14 +4,18 @@ import pandas as pd
 from pandas import DataFrame, read_csv
 import pyarrow as pa
 import os
-from datetime import datetime
+from datetime import date, datetime, timezone
 from choc_an_simulator.provider import (
     show_provider_menu,
     check_in_member,
     display_member_information,
     record_service_billing_entry,
+    ProviderDirectoryCache,
+    InvalidMemberCache,
     request_provider_directory,
+    _write_service_log,
 )
+from choc_an_simulator.database_management import RecordBuffer
 from definitions import PROVIDER_DIR_CSV
 from choc_an_simulator.provider import (
     SERVICE_LOG_INFO,
@@ -90,6 +94,38 @@ def test_check_in_member(member_info, member_id, expected_out, capsys, mocker):
     assert captured_out == expected_out
 
 
+def test_check_in_member_invalid_cached(capsys, mocker):
+    """Test that an invalid member ID is only looked up once per session."""
+    mocker.patch("choc_an_simulator.provider.prompt_int", return_value=123456789)
+    load_records = mocker.patch(
+        "choc_an_simulator.provider.load_records_from_file", return_value=DataFrame()
+    )
+    invalid_members = InvalidMemberCache()
+    check_in_member(invalid_members)
+    check_in_member(invalid_members)
+    load_records.assert_called_once()
+    assert capsys.readouterr().out == "\033[91mInvalid\033[0m\n" * 2
+
+
+def test_check_in_member_user_exit(mocker):
+    """Test that no member is looked up when the user exits the prompt."""
+    mocker.patch("choc_an_simulator.provider.prompt_int", return_value=None)
+    load_records = mocker.patch("choc_an_simulator.provider.load_records_from_file")
+    check_in_member()
+    load_records.assert_not_called()
+
+
+def test_invalid_member_cache_limit(mocker):
+    """Test that the invalid member cache forgets its oldest IDs once full."""
+    mocker.patch("choc_an_simulator.provider._MAX_INVALID_MEMBER_IDS", 2)
+    invalid_members = InvalidMemberCache()
+    for member_id in [1, 2, 2, 3]:
+        invalid_members.add(member_id)
+    assert 1 not in invalid_members
+    assert 2 in invalid_members
+    assert 3 in invalid_members
+
+
 def test_display_member_information():
     """Verify input validation & database lookups for display_member_information."""
     with pytest.raises(NotImplementedError):
@@ -271,7 +307,12 @@ def test_record_service_billing(
             )
         elif raise_error_at == "log" and args[0] == SERVICE_LOG_INFO:
             raise ArrowIOError("Failed to add service log information to the file")
-        return dataframes_to_return.pop(0)
+        records = dataframes_to_return.pop(0)
+        # Apply equality filters to the columns included in the returned dataframe
+        for col, val in (kwargs.get("eq_cols") or {}).items():
+            if col in records.columns:
+                records = records[records[col] == val]
+        return records
 
     # Mock the add_records_to_file function to simulate errors in data saving if required
     if raise_add_records_error:
@@ -309,6 +350,236 @@ def test_record_service_billing(
     assert expected_output in captured_output
 
 
+@pytest.fixture()
+def mock_billing_entry_inputs(mocker):
+    """Simulates a provider entering a valid service, and returns the mocked record loader."""
+    load_records = mocker.patch(
+        "choc_an_simulator.provider.load_records_from_file",
+        side_effect=[
+            pd.DataFrame({"member_id": [111111111]}),
+            pd.DataFrame({"id": [222222222]}),
+            pd.DataFrame(
+                {
+                    "service_id": [555555],
+                    "service_name": ["Test service"],
+                    "price_dollars": [100],
+                    "price_cents": [50],
+                }
+            ),
+        ],
+    )
+    mocker.patch("choc_an_simulator.provider.prompt_str", side_effect=["y", None])
+    mocker.patch(
+        "choc_an_simulator.provider.prompt_int",
+        side_effect=[111111111, 222222222, 555555],
+    )
+    mocker.patch(
+        "choc_an_simulator.provider.prompt_date", return_value=date(2023, 11, 26)
+    )
+    return load_records
+
+
+def test_record_service_billing_buffered(mock_billing_entry_inputs, mocker, capsys):
+    """Test that a billing entry is added to the service log buffer, when one is given."""
+    load_records = mock_billing_entry_inputs
+    add_records = mocker.patch("choc_an_simulator.provider.add_records_to_file")
+    service_log = mocker.MagicMock()
+
+    record_service_billing_entry(service_log)
+
+    add_records.assert_not_called()
+    service_log.flush.assert_not_called()
+    load_records.assert_any_call(
+        MEMBER_INFO, eq_cols={"member_id": 111111111}, columns=["member_id"]
+    )
+    # Only providers, not managers, can record a service.
+    load_records.assert_any_call(
+        USER_INFO, eq_cols={"id": 222222222, "type": 1}, columns=["id"]
+    )
+    record = service_log.append.call_args.args[0]
+    assert record["member_id"] == 111111111
+    assert record["provider_id"] == 222222222
+    assert record["service_id"] == 555555
+    assert record["service_date_utc"] == date(2023, 11, 26)
+    assert record["entry_datetime_utc"].tzinfo == timezone.utc
+    SERVICE_LOG_INFO.check_series(pd.Series(record))
+    assert "Service Billing Entry Recorded Successfully" in capsys.readouterr().out
+
+
+def test_record_service_billing_buffered_pending(
+    mock_billing_entry_inputs, mocker, capsys
+):
+    """Test that an entry is kept in the buffer, and not written, until the batch is full."""
+    add_records = mocker.patch(
+        "choc_an_simulator.database_management.record_buffer.add_records_to_file"
+    )
+    service_log = RecordBuffer(SERVICE_LOG_INFO, batch_size=2)
+
+    record_service_billing_entry(service_log)
+
+    add_records.assert_not_called()
+    assert len(service_log) == 1
+    output = capsys.readouterr().out
+    assert (
+        "It will be saved to the service log with the next batch of entries" in output
+    )
+    assert "Service Billing Entry Recorded Successfully" not in output
+
+
+def test_record_service_billing_buffered_io_error(
+    mock_billing_entry_inputs, mocker, capsys
+):
+    """Test that an entry that fails to be written by an I/O error is kept to be retried."""
+    mocker.patch(
+        "choc_an_simulator.database_management.record_buffer.add_records_to_file",
+        side_effect=ArrowIOError,
+    )
+    service_log = RecordBuffer(SERVICE_LOG_INFO, batch_size=1)
+
+    record_service_billing_entry(service_log)
+
+    assert len(service_log) == 1
+    output = capsys.readouterr().out
+    assert "Failed to add service log information to the file" in output
+    assert "The entry will be retried with the next entry" in output
+    assert "Service Billing Entry Recorded Successfully" not in output
+
+
+@pytest.mark.parametrize(
+    "error_type", [ValueError, TypeError, KeyError, ArithmeticError]
+)
+def test_record_service_billing_buffered_write_error(
+    error_type, mock_billing_entry_inputs, mocker, capsys
+):
+    """Test that entries that can't be written for reasons other than I/O are discarded."""
+    mocker.patch(
+        "choc_an_simulator.database_management.record_buffer.add_records_to_file",
+        side_effect=error_type,
+    )
+    service_log = RecordBuffer(SERVICE_LOG_INFO, batch_size=1)
+
+    record_service_billing_entry(service_log)
+
+    assert len(service_log) == 0
+    output = capsys.readouterr().out
+    assert "1 service entries were discarded." in output
+    assert "The entry will be retried" not in output
+    assert "Service Billing Entry Recorded Successfully" not in output
+
+
+def test_record_service_billing_buffered_invalid(
+    mock_billing_entry_inputs, mocker, capsys
+):
+    """Test that an invalid entry is rejected before it is added to the buffer."""
+    service_log = mocker.MagicMock()
+    service_log.check_record.side_effect = ValueError
+
+    record_service_billing_entry(service_log)
+
+    service_log.append.assert_not_called()
+    service_log.flush.assert_not_called()
+    output = capsys.readouterr().out
+    assert "Invalid service entry, it was not recorded" in output
+    assert "Service Billing Entry Recorded Successfully" not in output
+
+
+def test_write_service_log_retry(mocker):
+    """Test that entries that fail to be written by an I/O error are written by the next flush."""
+    add_records = mocker.patch(
+        "choc_an_simulator.database_management.record_buffer.add_records_to_file",
+        side_effect=[ArrowIOError, None],
+    )
+    service_log = RecordBuffer(SERVICE_LOG_INFO)
+    service_log.append(
+        {
+            "entry_datetime_utc": datetime(2023, 11, 26, tzinfo=timezone.utc),
+            "service_date_utc": date(2023, 11, 26),
+            "provider_id": 222222222,
+            "member_id": 111111111,
+            "service_id": 555555,
+            "comments": None,
+        }
+    )
+    assert not _write_service_log(service_log, service_log.flush)
+    assert len(service_log) == 1
+    assert _write_service_log(service_log, service_log.flush)
+    assert len(service_log) == 0
+    assert len(add_records.call_args.args[0]) == 1
+
+
+def test_show_provider_menu_flushes_service_log(mocker):
+    """Test that entries recorded during a provider session are written on exit."""
+    service_log = mocker.patch("choc_an_simulator.provider.RecordBuffer").return_value
+    mocker.patch("choc_an_simulator.provider.prompt_menu_options", return_value=None)
+    show_provider_menu()
+    service_log.flush.assert_called_once()
+
+
+def test_show_provider_menu_saves_pending_entries(mocker, capsys):
+    """Test that the number of entries written on exit is displayed."""
+    service_log = mocker.patch("choc_an_simulator.provider.RecordBuffer").return_value
+    service_log.__len__.return_value = 2
+    mocker.patch("choc_an_simulator.provider.prompt_menu_options", return_value=None)
+    show_provider_menu()
+    assert "2 service entries saved to the service log." in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "error_type,expected",
+    [
+        (ArrowIOError, "2 service entries were not recorded."),
+        (ValueError, "2 service entries were discarded."),
+        (TypeError, "2 service entries were discarded."),
+        (KeyError, "2 service entries were discarded."),
+        (ArithmeticError, "2 service entries were discarded."),
+    ],
+)
+def test_show_provider_menu_flush_error(error_type, expected, mocker, capsys):
+    """Test that errors writing the service log at the end of a session are displayed."""
+    service_log = mocker.patch("choc_an_simulator.provider.RecordBuffer").return_value
+    service_log.flush.side_effect = error_type
+    service_log.__len__.return_value = 2
+    mocker.patch("choc_an_simulator.provider.prompt_menu_options", return_value=None)
+    show_provider_menu()
+    output = capsys.readouterr().out
+    assert "Failed to add service log information to the file" in output
+    assert expected in output
+
+
+def test_provider_directory_cache(mocker):
+    """Test that the provider directory is loaded once, on the first lookup."""
+    load_records = mocker.patch(
+        "choc_an_simulator.provider.load_records_from_file",
+        return_value=pd.DataFrame(
+            {
+                "service_id": [555555, 666666],
+                "service_name": ["Test service", "Other service"],
+                "price_dollars": [100, 20],
+                "price_cents": [50, 5],
+            }
+        ),
+    )
+    service_directory = ProviderDirectoryCache()
+    load_records.assert_not_called()
+    assert service_directory.get(555555) == ("Test service", 100, 50)
+    assert service_directory.get(666666) == ("Other service", 20, 5)
+    assert service_directory.get(999999) is None
+    load_records.assert_called_once()
+
+
+def test_provider_directory_cache_io_error(mocker):
+    """Test that a failed load is raised, and retried by the next lookup."""
+    load_records = mocker.patch(
+        "choc_an_simulator.provider.load_records_from_file",
+        side_effect=ArrowIOError,
+    )
+    service_directory = ProviderDirectoryCache()
+    for _ in range(2):
+        with pytest.raises(ArrowIOError):
+            service_directory.get(555555)
+    assert load_records.call_count == 2
+
+
 def test_request_provider_directory(mocker, capsys) -> None:
     """Verify correct file creation for request_provider_directory and output of filepath"""
     expected_save_path = PROVIDER_DIR_CSV
@@ -1,4 +1,5 @@
 from datetime import date, datetime
+import time
 from unittest.mock import patch
 
 import pandas as pd
@@ -12,8 +13,11 @@ from choc_an_simulator.report import (
     generate_member_report,
     generate_provider_report,
     generate_summary_report,
+    calculate_total_fee,
+    _cap_total_fees,
+    _save_reports,
 )
-from choc_an_simulator.schemas import TableInfo
+from choc_an_simulator.schemas import TableInfo, PROVIDER_DIRECTORY_INFO, USER_INFO
 
 """
 Create test data for the generate_member_report function.
@@ -173,6 +177,17 @@ def load_records_from_file_side_effect(*args, **kwargs):
         return test_provider_directory_info
 
 
+def saved_reports_in_order(mock_save_report) -> list:
+    """
+    Get the reports passed to a mocked save_report, in the order the report function made them.
+
+    Reports are saved concurrently, so the order of the calls may vary. Each report holds a group
+    of rows in order of first appearance, so the index of its first row restores the order.
+    """
+    saved_reports = [call.args[0] for call in mock_save_report.call_args_list]
+    return sorted(saved_reports, key=lambda report: report.index[0])
+
+
 def save_report_side_effect(*args, **kwargs):
     """
     Side effect for the save_report function.
@@ -616,8 +631,8 @@ def test_generate_member_report(
     assert captured.out == expected_output_for_member
 
     actual_df = pd.DataFrame()
-    for i in range(mock_save_report.call_args_list.__len__()):
-        actual_df = actual_df._append(mock_save_report.call_args_list[i][0][0])
+    for saved_report in saved_reports_in_order(mock_save_report):
+        actual_df = actual_df._append(saved_report)
 
     assert actual_df.equals(expected_member_report_df)
 
@@ -636,6 +651,31 @@ def test_generate_member_report_no_members(mock_load_records_from_file, capsys):
     assert captured.out == expected_output
 
 
+@patch("choc_an_simulator.report.save_report")
+@patch("choc_an_simulator.report.load_records_from_file")
+def test_generate_member_report_unknown_members(
+    mock_load_records_from_file, mock_save_report, capsys
+):
+    """
+    Test the generate_member_report function when none of the logged services' members are in
+    the member table.
+    """
+
+    def load_without_members(*args, **kwargs):
+        if args[0].name == "members":
+            return test_member_info.iloc[0:0]
+        return load_records_from_file_side_effect(*args, **kwargs)
+
+    mock_load_records_from_file.side_effect = load_without_members
+    expected_output = "No records found within the last 7 days.\n"
+
+    generate_member_report()
+    captured = capsys.readouterr()
+
+    assert captured.out == expected_output
+    mock_save_report.assert_not_called()
+
+
 @patch("choc_an_simulator.report.load_records_from_file", side_effect=ArrowIOError)
 def test_generate_member_report_arrow_io_error(mock_load_records_from_file, capsys):
     """Test the generate_member_report function with a KeyError."""
@@ -664,8 +704,8 @@ def test_generate_provider_report(
     assert captured == expected_output_for_provider
 
     actual_df = pd.DataFrame()
-    for i in range(mock_save_report.call_args_list.__len__()):
-        actual_df = actual_df._append(mock_save_report.call_args_list[i][0][0])
+    for saved_report in saved_reports_in_order(mock_save_report):
+        actual_df = actual_df._append(saved_report)
 
     actual_df = actual_df.reset_index(drop=True)
 
@@ -693,8 +733,8 @@ def test_generate_provider_report_has_total_fees_over_99999_99(
     assert captured == expected_output_for_provider
 
     actual_df = pd.DataFrame()
-    for i in range(mock_save_report.call_args_list.__len__()):
-        actual_df = actual_df._append(mock_save_report.call_args_list[i][0][0])
+    for saved_report in saved_reports_in_order(mock_save_report):
+        actual_df = actual_df._append(saved_report)
 
     actual_df = actual_df.reset_index(drop=True)
 
@@ -722,8 +762,8 @@ def test_generate_provider_report_has_total_consults_over_999(
     assert captured == expected_output_for_provider
 
     actual_df = pd.DataFrame()
-    for i in range(mock_save_report.call_args_list.__len__()):
-        actual_df = actual_df._append(mock_save_report.call_args_list[i][0][0])
+    for saved_report in saved_reports_in_order(mock_save_report):
+        actual_df = actual_df._append(saved_report)
 
     actual_df = actual_df.reset_index(drop=True)
 
@@ -774,6 +814,24 @@ def test_generate_summary_report(
     actual_df = mock_save_report.call_args_list[0][0][0]
 
     assert_frame_equal(actual_df, expected_summary_report_df)
+    # Only the columns used by the report, of providers in the service log, are read
+    user_info_call = next(
+        call
+        for call in mock_load_records_from_file.call_args_list
+        if call.args[0] == USER_INFO
+    )
+    assert user_info_call.kwargs["columns"] == ["name", "id"]
+    assert set(user_info_call.kwargs["isin_cols"]["id"]) == set(
+        test_service_log_info["provider_id"]
+    )
+    directory_call = next(
+        call
+        for call in mock_load_records_from_file.call_args_list
+        if call.args[0] == PROVIDER_DIRECTORY_INFO
+    )
+    assert set(directory_call.kwargs["isin_cols"]["service_id"]) == set(
+        test_service_log_info["service_id"]
+    )
 
 
 @patch("choc_an_simulator.report.load_records_from_file", side_effect=ArrowIOError)
@@ -846,3 +904,45 @@ def test_generate_summary_report_provider_has_total_fees_over_99999_99(
     actual_df = mock_save_report.call_args_list[0][0][0]
 
     assert_frame_equal(actual_df, expected_summary_report_total_fee_over_99999_99_df)
+
+
+def test_calculate_total_fee():
+    """Test that fees in cents are totalled in dollars without rounding error."""
+    assert calculate_total_fee(pd.Series([10, 20] * 5)) == 1.5
+
+
+def test_cap_total_fees():
+    """Test that total fees over $99,999.99 are set to $99,999.99."""
+    capped_fees = _cap_total_fees(pd.Series([99999.99, 100000.0, 0.1 + 0.2]))
+    assert capped_fees.tolist() == [99999.99, 99999.99, 0.3]
+
+
+def test_save_reports_same_file_name():
+    """Test that reports with the same file name are saved in order, by one worker at a time."""
+    reports = [
+        (pd.DataFrame({"Name": ["Jo"]}, index=[0]), "Jo_01-08-2023"),
+        (pd.DataFrame({"Name": ["Al"]}, index=[1]), "Al_01-08-2023"),
+        (pd.DataFrame({"Name": ["Jo"]}, index=[2]), "Jo_01-08-2023"),
+    ]
+    saving = set()
+    saved_in_order = []
+
+    def slow_save_report(report, file_name):
+        # A second save of the same file starting before the first finishes would overlap
+        assert file_name not in saving
+        saving.add(file_name)
+        time.sleep(0.05)
+        saved_in_order.append(report.index[0])
+        saving.discard(file_name)
+        return save_report_side_effect(report, file_name)
+
+    with patch("choc_an_simulator.report.save_report", side_effect=slow_save_report):
+        paths = _save_reports(reports)
+
+    assert paths == [
+        "/path/to/report/Jo_01-08-2023.csv",
+        "/path/to/report/Al_01-08-2023.csv",
+        "/path/to/report/Jo_01-08-2023.csv",
+    ]
+    # The last report with the file name is saved last, so it is the one kept
+    assert [index for index in saved_in_order if index != 1] == [0, 2]
@@ -1,10 +1,13 @@
 """Tests of the TableInfo class and schema constants in the schemas module."""
+from datetime import date, datetime
+import pickle
 from typing import Dict
 
+import numpy as np
 import pytest
 import pandas as pd
 import pyarrow as pa
-from choc_an_simulator.schemas import TableInfo
+from choc_an_simulator.schemas import TableInfo, _str_lengths, _TYPE_PREDICATES
 
 
 @pytest.fixture()
@@ -69,6 +72,19 @@ class TestTableInfo:
                 numeric_limits=numeric_limits,
             )
 
+    def test_table_info_initialization_invalid_format(self, test_schema):
+        """Test table_info initialization with an unsupported file format."""
+        with pytest.raises(ValueError):
+            TableInfo(name="test", schema=test_schema, file_format="csv")
+
+    def test_table_info_pickle(self, test_info):
+        """Test that a TableInfo can be pickled, and still checks records once unpickled."""
+        unpickled = pickle.loads(pickle.dumps(test_info))
+        assert unpickled == test_info
+        unpickled.check_field(200, "number")
+        with pytest.raises(ArithmeticError):
+            unpickled.check_field(199, "number")
+
     def test_index_col(self, test_info):
         """Test the check_dataframe function."""
         assert test_info.index_col() == "number"
@@ -90,9 +106,18 @@ class TestTableInfo:
         """Test of the includes_columns function."""
         assert test_info.includes_columns(columns) == includes
 
-    def test_check_columns(self, test_info):
+    @pytest.mark.parametrize(
+        "columns",
+        [
+            # Schema order
+            (["number", "text"]),
+            # Different order
+            (["text", "number"]),
+        ],
+    )
+    def test_check_columns(self, test_info, columns):
         """Test of the check_columns function."""
-        test_info.check_columns(["number", "text"])
+        test_info.check_columns(columns)
 
     @pytest.mark.parametrize(
         "columns",
@@ -127,6 +152,18 @@ class TestTableInfo:
             (pd.DataFrame({"text": ["123"]}), KeyError),
             # Wrong type
             (pd.DataFrame({"number": ["a"], "text": ["123"]}), TypeError),
+            # Out of numeric range after the first row
+            (
+                pd.DataFrame({"number": [200, 199], "text": ["abc", "abc"]}),
+                ArithmeticError,
+            ),
+            # Out of character range after the first row
+            (
+                pd.DataFrame({"number": [200, 200], "text": ["abc", "12"]}),
+                ArithmeticError,
+            ),
+            # Wrong type after the first row
+            (pd.DataFrame({"number": [200, "a"], "text": ["abc", "abc"]}), TypeError),
         ],
     )
     def test_check_dataframe_invalid(self, dataframe, error_type, test_info):
@@ -134,6 +171,12 @@ class TestTableInfo:
         with pytest.raises(error_type):
             test_info.check_dataframe(dataframe)
 
+    def test_check_dataframe_column_type_error(self, test_info, mocker):
+        """Test a column that fails its type check when none of its values fail alone."""
+        mocker.patch.object(TableInfo, "_check_type")
+        with pytest.raises(TypeError, match="Column number has wrong type"):
+            test_info.check_dataframe(pd.DataFrame({"number": ["a"], "text": ["abc"]}))
+
     def test_check_series_valid(self, test_info):
         """Test a successful call to check_series()."""
         test_info.check_series(pd.Series({"number": 200, "text": "abc"}))
@@ -180,3 +223,55 @@ class TestTableInfo:
         """Parameterized tests of failed calls to check_field()."""
         with pytest.raises(error_type):
             test_info.check_field(field_val, field_name)
+
+
+@pytest.mark.parametrize(
+    "column",
+    [
+        # Integers, including zero, negatives, and the limits of int64
+        pd.Series([0, 9, 10, -10, 99999, 100000, -(2**63), 2**63 - 1]),
+        # Unsigned integers
+        pd.Series([0, 10, 2**64 - 1], dtype="uint64"),
+        # Strings, including non-ASCII characters
+        pd.Series(["", "abc", "héllo"]),
+        # Strings with a missing value
+        pd.Series(["abc", None]),
+        # Bytes
+        pd.Series([b"abc"]),
+        # Floats
+        pd.Series([1.5, 200.0]),
+    ],
+)
+def test_str_lengths(column):
+    """Test that _str_lengths matches the length of each value converted with str()."""
+    assert list(_str_lengths(column)) == [len(str(value)) for value in column]
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        0,
+        2**63 - 1,
+        -(2**63),
+        2**63,
+        True,
+        np.int32(5),
+        np.uint64(5),
+        1.0,
+        "abc",
+        b"abc",
+    ]
+    + [np.bool_(False), date(2023, 1, 1), datetime(2023, 1, 1), None],
+)
+@pytest.mark.parametrize("field_type", list(_TYPE_PREDICATES))
+def test_type_predicates(field_type, value):
+    """Test that every value accepted by a type predicate can be converted by Arrow."""
+    if _TYPE_PREDICATES[field_type](value):
+        pa.array([value], type=field_type)
+
+
+def test_check_field_int_out_of_range():
+    """Test that an integer too large for its field falls back to Arrow's type check."""
+    table_info = TableInfo("test", pa.schema([pa.field("number", pa.int64())]))
+    with pytest.raises(OverflowError):
+        table_info.check_field(2**63, "number")
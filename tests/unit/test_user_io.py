@@ -1,4 +1,5 @@
 """Tests of the user_io module."""
+import re
 from datetime import date
 import pytest
 from choc_an_simulator.user_io import (
@@ -64,6 +65,8 @@ class TestPromptDate:
             ),
             # Invalid
             (["invalid", "2-1-2021"], None, None, date(2021, 2, 1)),
+            # Day not in month
+            (["2-30-2021", "2-1-2021"], None, None, date(2021, 2, 1)),
         ],
     )
     @pytest.mark.usefixtures("mock_input_series")
@@ -114,6 +117,17 @@ class TestPromptMenuOptions:
         """Test that pressing 'Ctrl+C' returns None."""
         assert prompt_menu_options("Choose an option:", ["Option 1"]) is None
 
+    @pytest.mark.parametrize("input_strs", [["1"]])
+    @pytest.mark.usefixtures("mock_input_series")
+    def test_prompt_menu_options_output(self, mock_input_series, capsys):
+        """Test that the menu prints the message, then each choice with a green number."""
+        prompt_menu_options("Choose an option:", ["A", "B"])
+        green = PColor.AnsiColor.OKGREEN.value
+        expected = (
+            f"Choose an option:\n{green}1: {PColor._ENDC}A\n{green}2: {PColor._ENDC}B\n"
+        )
+        assert capsys.readouterr().out == expected
+
 
 class TestToInt:
     """Validate functionality and error handling of the _to_int_ function."""
@@ -133,6 +147,14 @@ class TestToInt:
             ("", None),
             # Special characters
             ("@#$", None),
+            # Surrounding whitespace
+            (" 123 ", 123),
+            # Digit separators
+            ("1_000", 1000),
+            # Misplaced digit separator
+            ("1__000", None),
+            # Explicit sign
+            ("+123", 123),
         ],
     )
     def test_to_int_valid(self, input, expected_output):
@@ -160,6 +182,8 @@ class TestPromptInt:
             (["1", "100"], 100, range(2, 4), None),
             # Above character limit
             (["10000", "100"], 100, range(2, 4), None),
+            # Fixed width, not all digits
+            (["-12", "+12", " 12", "123"], 123, range(3, 3), None),
         ],
     )
     @pytest.mark.usefixtures("mock_input_series")
@@ -194,6 +218,20 @@ class TestPromptString:
         """Test prompt_string using a list of parameters."""
         assert prompt_str("Input", char_limit) == expected
 
+    @pytest.mark.parametrize(
+        "input_strs,expected",
+        [
+            # Valid
+            (["OR"], "OR"),
+            # Doesn't match pattern
+            (["or", "O1", "OR"], "OR"),
+        ],
+    )
+    @pytest.mark.usefixtures("mock_input_series")
+    def test_prompt_string_pattern(self, mock_input_series, expected):
+        """Test prompt_string with a required input format."""
+        assert prompt_str("Input", range(2, 2), re.compile(r"[A-Z]{2}")) == expected
+
     @pytest.mark.usefixtures("mock_input_ctrl_c")
     def test_prompt_string_ctrl_c(self, mock_input_ctrl_c):
         """Test when the user presses 'Ctrl+C'."""